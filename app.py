@@ -3,27 +3,38 @@ from tkinter import ttk, messagebox
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-import os
 from main_ui import MainUI
 from asset_list import AssetList
 from reminders import Reminders
 from brokerage import BrokerageManagement
+from sheet_cache import SheetCache
+from sheet_mirror import SheetMirror
+from io_worker import IOWorker
+from write_queue import WriteQueue
+from drive_uploads import DriveUploader
+from prefetch import DriveFolderCache
 
 
 
 class PropertyManagementApp:
-    def __init__(self, master, main_folder_id):
+    def __init__(self, master, main_folder_id, cache_ttl=300, mirror_path=None):
         self.master = master
         self.master.title("AsseTRA")
         self.master.geometry("1400x700")
         self.master.configure(bg="#f0f0f0")
 
         self.main_folder_id = main_folder_id
+        self.cache_ttl = cache_ttl
+        self.mirror_path = mirror_path
+        self.seeded_from_mirror = False
 
         # Custom styles
         self.setup_styles()
 
+        # Background worker for Google API calls
+        self.io = IOWorker(self.master)
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Google Sheets and Drive setup
         self.setup_google_services()
 
@@ -33,8 +44,16 @@ class PropertyManagementApp:
         # Bind global scroll events
         self.bind_scroll_events()
 
-        # Start periodic reminders check
-        self.check_reminders_periodically()
+        # Catch up with the live sheet when we started from the local mirror
+        if self.seeded_from_mirror:
+            self.start_background_sync()
+
+        # Finish asset submissions an earlier session was cut off in
+        journal = self.drive_uploader.journal
+        if journal.pending_submissions() or journal.pending():
+            self.io.submit(self.main_ui.resume_submissions,
+                           on_success=self.on_uploads_resumed,
+                           on_error=lambda e: print(f"Failed to resume submissions: {str(e)}"))
 
     def setup_styles(self):
         self.style = ttk.Style()
@@ -79,6 +98,10 @@ class PropertyManagementApp:
 
             creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_json, scope)
             self.drive_service = build('drive', 'v3', credentials=creds)
+            # Uploads run on worker threads with their own Drive services
+            self.drive_uploader = DriveUploader(creds, self.main_folder_id)
+            # Document folder listings, warmed ahead of the user
+            self.drive_folders = DriveFolderCache(self.io, self.drive_uploader)
             client = gspread.authorize(creds)
 
             spreadsheet_id = '1orIbEddJvC9PExzZnfxct8xW-fz_w9PVk32u3QO5694'
@@ -89,6 +112,22 @@ class PropertyManagementApp:
             if not self.headers:
                 raise ValueError("No headers found in the Google Sheet")
 
+            # Local mirror of the sheet and the shared snapshot used by every tab
+            self.sheet_mirror = SheetMirror(self.mirror_path)
+            self.sheet_cache = SheetCache(self.sheet, ttl=self.cache_ttl, mirror=self.sheet_mirror,
+                                          headers=self.headers)
+
+            # Cell updates are batched and written behind the UI
+            self.write_queue = WriteQueue(self.master, self.sheet, self.io,
+                                          cache=self.sheet_cache,
+                                          on_failure=self.on_write_failure)
+
+            # Render from the mirror right away; a background sync catches up
+            mirrored = self.sheet_mirror.load()
+            if mirrored:
+                self.sheet_cache.seed(mirrored)
+                self.seeded_from_mirror = True
+
             # Set the date format for the sheet
             self.set_date_format()
 
@@ -107,24 +146,6 @@ class PropertyManagementApp:
             messagebox.showerror("Error", f"Failed to access the main folder: {str(e)}")
             raise
 
-    def create_subfolder(self, folder_name, parent_id=None):
-        folder_metadata = {
-            'name': folder_name,
-            'mimeType': 'application/vnd.google-apps.folder',
-            'parents': [parent_id or self.main_folder_id]
-        }
-        folder = self.drive_service.files().create(body=folder_metadata, fields='id').execute()
-        return folder['id']
-
-    def upload_file_to_folder(self, file_path, folder_id):
-        file_metadata = {
-            'name': os.path.basename(file_path),
-            'parents': [folder_id]
-        }
-        media = MediaFileUpload(file_path, resumable=True)
-        file = self.drive_service.files().create(body=file_metadata, media_body=media, fields='id').execute()
-        return file.get('id')
-
     def create_layout(self):
         self.notebook = ttk.Notebook(self.master)
         self.notebook.pack(fill=tk.BOTH, expand=True)
@@ -168,10 +189,46 @@ class PropertyManagementApp:
         }
         self.sheet.format("O:O", date_format)
 
-    def check_reminders_periodically(self):
+    def start_background_sync(self):
+        # Re-render every tab from the freshly synced mirror once the sync lands
+        self.io.submit(self.sheet_cache.get_all_values,
+                       force=True,
+                       on_success=lambda values: self.refresh_all_tabs(),
+                       on_error=lambda e: print(f"Background sheet sync failed: {str(e)}"))
+
+    def on_uploads_resumed(self, resumed):
+        if resumed:
+            names = "\n".join(resumed)
+            messagebox.showinfo("Submissions Resumed",
+                                f"Finished submitting assets interrupted in an earlier session:\n{names}")
+            self.asset_list.update_asset_list()
+
+    def refresh_all_tabs(self):
+        self.asset_list.update_asset_list()
         self.reminders.refresh_reminders()
-        # Check reminders every hour (3600000 milliseconds)
-        self.master.after(3600000, self.check_reminders_periodically)
+        self.brokerage.refresh_brokerage_data()
+
+    def on_write_failure(self, error, count):
+        retry = messagebox.askretrycancel(
+            "Sheet Update Error",
+            f"{count} pending sheet update(s) could not be saved:\n{str(error)}"
+        )
+        if retry:
+            self.write_queue.retry_failed()
+        else:
+            self.write_queue.discard_failed(error)
+
+    def on_close(self):
+        # Push out anything still waiting in the write queue, including
+        # writes that failed and were never retried or discarded
+        if self.write_queue.pending or self.write_queue.failed:
+            try:
+                self.write_queue.flush_blocking()
+            except Exception as e:
+                print(f"Failed to save pending sheet updates: {str(e)}")
+        self.io.shutdown()
+        self.drive_uploader.shutdown()
+        self.master.destroy()
 
     def bind_scroll_events(self):
         self.master.bind_all("<MouseWheel>", self._on_mousewheel)
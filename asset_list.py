@@ -2,11 +2,29 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from ttkbootstrap import Style
 import webbrowser
+from detail_view import AssetDetailView
+from prefetch import folder_id_from_link
+from filter_query import compile_query, FilterQueryError
+from tree_views import ColumnSorter, TreeLoader
 
 class AssetList:
+    # Sheet columns this tab renders: display columns plus document status (X-AB)
+    COLUMNS = ("A", "C:G", "K:M", "X:AC")
+    # Pause after the last keystroke before search-as-you-type runs
+    SEARCH_DEBOUNCE_MS = 250
+    # How long a row must stay selected or hovered before it is prefetched
+    PREFETCH_DWELL_MS = 300
+    # Minimum trigram similarity for a fuzzy match to be listed
+    FUZZY_THRESHOLD = 0.3
+
     def __init__(self, parent, app):
         self.parent = parent
         self.app = app
+        self._search_after = None
+        self._filtered = False
+        self._view = None
+        self._prefetch_after = None
+        self._hover_item = None
         self.style = Style(theme='flatly')
         self.setup_styles()
         self.create_asset_list_ui()
@@ -136,18 +154,17 @@ class AssetList:
                          if search_entry.get() == "Search assets..." else None)
         search_entry.bind('<FocusOut>', lambda e: search_entry.insert(0, "Search assets...")
                          if search_entry.get() == "" else None)
+        search_entry.bind('<Return>', lambda e: self.search_assets())
+
+        # Search as you type, once typing pauses
+        self.search_var.trace_add('write', self._on_search_changed)
 
         # Action buttons
-        search_button = ttk.Button(search_container,
-                                 text="Search",
-                                 style="primary.TButton",
-                                 command=self.search_assets)
-        search_button.pack(side=tk.LEFT, padx=5)
 
         refresh_button = ttk.Button(search_container,
                                   text="↻ Refresh List",
                                   style="primary.TButton",
-                                  command=self.update_asset_list)
+                                  command=lambda: self.update_asset_list(force=True))
         refresh_button.pack(side=tk.LEFT, padx=5)
 
         open_sheet_button = ttk.Button(search_container,
@@ -156,6 +173,24 @@ class AssetList:
                                       command=self.open_google_sheet)
         open_sheet_button.pack(side=tk.LEFT, padx=5)
 
+        self.loading_label = ttk.Label(search_container,
+                                       text="",
+                                       style='Subtitle.TLabel')
+        self.loading_label.pack(side=tk.LEFT, padx=10)
+
+        self.noncompliant_only = tk.BooleanVar(value=False)
+        noncompliant_check = ttk.Checkbutton(search_container,
+                                             text="Non-compliant only",
+                                             variable=self.noncompliant_only,
+                                             command=self._reload_current_view)
+        noncompliant_check.pack(side=tk.RIGHT, padx=5)
+
+        # Per-document count of assets still missing that document
+        self.compliance_label = ttk.Label(search_frame,
+                                          text="",
+                                          style='Subtitle.TLabel')
+        self.compliance_label.pack(anchor=tk.W, pady=(8, 0))
+
         # Assets list container
         list_frame = ttk.Frame(main_container, style='Card.TFrame', padding=20)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
@@ -198,11 +233,18 @@ class AssetList:
             self.asset_list.heading(header, text=header, anchor=tk.W)
             self.asset_list.column(header, width=column_widths[header], minwidth=50, anchor=tk.W)
 
+        # Click a heading to sort by the sheet column behind it
+        self.sorter = ColumnSorter(self.asset_list,
+                                   dict(zip(display_columns, [0, 2, 3, 4, 5, 6, 10, 11, 12, 28])),
+                                   self._render_view)
+
         scrollbar = ttk.Scrollbar(list_frame,
                                 orient="vertical",
                                 command=self.asset_list.yview)
         self.asset_list.configure(yscrollcommand=scrollbar.set)
 
+        # Large portfolios are shown through a fixed pool of recycled items
+        self.loader = TreeLoader(self.asset_list, scrollbar, self.app.io, self.loading_label, "assets")
 
         # Bind mousewheel events directly to the Treeview
         self.asset_list.bind('<MouseWheel>', self._on_mousewheel)  # Windows
@@ -212,246 +254,45 @@ class AssetList:
         self.asset_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+        # Reused for every asset opened from this list
+        self.detail_view = AssetDetailView(self.parent, self.app, self.colors,
+                                           groups={
+                                               'Basic Info': [0, 1, 2, 3, 4, 5],
+                                               'Property Details': [6, 7, 8, 9, 10],
+                                               'Financial Info': [11, 12, 13, 14, 15],
+                                               'Additional Details': [16, 17, 18, 19, 20]
+                                           },
+                                           show_brokerage=True,
+                                           on_status_updated=self.update_asset_list,
+                                           on_view_documents=self.show_documents,
+                                           on_close=self._restore_main_scrolling)
+
         # Event bindings
         self.asset_list.bind("<Double-1>", self.on_treeview_double_click)
         self.asset_list.bind('<Motion>', self.on_hover)
+        self.asset_list.bind('<<TreeviewSelect>>', self.on_selection_changed, add='+')
 
         # Initialize the list
         self.update_asset_list()
 
     def show_asset_details(self, values):
-        assets = self.app.sheet.get_all_values()
-        headers = assets[0]
-        full_row = next((row for row in assets[1:] if row[0] == values[0] and row[2] == values[1]), None)
-
-        if full_row:
-            details_window = tk.Toplevel(self.parent)
-            details_window.title("Asset Details")
-            details_window.geometry("700x600")
-            details_window.minsize(700, 600)
-
-            def on_window_close():
-                # Clean up canvas bindings
-                canvas.unbind_all("<MouseWheel>")
-                canvas.unbind_all("<Button-4>")
-                canvas.unbind_all("<Button-5>")
-                details_window.destroy()
-                # Restore main window scrolling
-                if hasattr(self.app.main_ui, '_restore_scrolling'):
-                    self.app.main_ui._restore_scrolling()
-
-            details_window.protocol("WM_DELETE_WINDOW", on_window_close)
-
-            # Main container
-            main_container = ttk.Frame(details_window, style='Card.TFrame')
-            main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-
-            # Header with property name and asset ID
-            header_frame = ttk.Frame(main_container, style='DetailHeader.TFrame')
-            header_frame.pack(fill=tk.X, pady=(0, 15))
-
-            header_content = ttk.Frame(header_frame, style='DetailHeader.TFrame', padding=(15, 10))
-            header_content.pack(fill=tk.X)
-
-            title = ttk.Label(header_content,
-                              text=f"{full_row[4]}",
-                              style='DetailHeader.TLabel')
-            title.pack(side=tk.LEFT)
-
-            asset_id = ttk.Label(header_content,
-                                 text=f"ID: {full_row[0]}",
-                                 style='DetailHeader.TLabel')
-            asset_id.pack(side=tk.RIGHT)
-
-            # Create content area with canvas for scrolling
-            content_frame = ttk.Frame(main_container, style='Card.TFrame')
-            content_frame.pack(fill=tk.BOTH, expand=True)
-
-            canvas = tk.Canvas(content_frame,
-                               bg=self.colors['surface'],
-                               highlightthickness=0)
-            scrollbar = ttk.Scrollbar(content_frame,
-                                      orient="vertical",
-                                      command=canvas.yview)
-            scrollable_frame = ttk.Frame(canvas, style='Content.TFrame')
-
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-            )
-
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw", width=canvas.winfo_width())
-            canvas.bind('<Configure>', lambda e: canvas.itemconfig(canvas.find_all()[0], width=e.width))
-
-            # Original groups
-            groups = {
-                'Basic Info': [0, 1, 2, 3, 4, 5],
-                'Property Details': [6, 7, 8, 9, 10],
-                'Financial Info': [11, 12, 13, 14, 15],
-                'Additional Details': [16, 17, 18, 19, 20]
-            }
-
-            # Add groups
-            for group_name, field_indices in groups.items():
-                group_frame = ttk.Frame(scrollable_frame, style='DetailRow.TFrame')
-                group_frame.pack(fill=tk.X, pady=5, padx=10)
-
-                ttk.Label(group_frame,
-                          text=group_name,
-                          style='DetailLabel.TLabel',
-                          font=('Segoe UI', 11, 'bold')).pack(anchor=tk.W, pady=(10, 5))
-
-                content_frame = ttk.Frame(group_frame, style='DetailRow.TFrame')
-                content_frame.pack(fill=tk.X, padx=15)
-
-                for idx in field_indices:
-                    if idx < len(headers) and idx < len(full_row):
-                        row = ttk.Frame(content_frame, style='DetailRow.TFrame')
-                        row.pack(fill=tk.X, pady=2)
-
-                        header_label = ttk.Label(row,
-                                                 text=f"{headers[idx]}:",
-                                                 style='DetailLabel.TLabel',
-                                                 width=20,
-                                                 anchor='e')
-                        header_label.pack(side=tk.LEFT, padx=(5, 10))
-
-                        value_label = ttk.Label(row,
-                                                text=str(full_row[idx] or '-'),
-                                                style='DetailValue.TLabel',
-                                                anchor='w')
-                        value_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-            # Add Brokerage Status Section
-            brokerage_frame = ttk.Frame(scrollable_frame, style='DetailRow.TFrame')
-            brokerage_frame.pack(fill=tk.X, pady=5, padx=10)
-
-            ttk.Label(brokerage_frame,
-                      text="Brokerage Status",
-                      style='DetailLabel.TLabel',
-                      font=('Segoe UI', 11, 'bold')).pack(anchor=tk.W, pady=(10, 5))
-
-            brokerage_content = ttk.Frame(brokerage_frame, style='DetailRow.TFrame')
-            brokerage_content.pack(fill=tk.X, padx=15)
-
-            status_row = ttk.Frame(brokerage_content, style='DetailRow.TFrame')
-            status_row.pack(fill=tk.X, pady=2)
-
-            ttk.Label(status_row,
-                      text=f"{headers[22]}:",  # Column W header
-                      style='DetailLabel.TLabel',
-                      width=20,
-                      anchor='e').pack(side=tk.LEFT, padx=(5, 10))
-
-            # Dropdown for brokerage status
-            status_var = tk.StringVar(value=full_row[22] or 'Pending')
-            status_dropdown = ttk.Combobox(status_row,
-                                           textvariable=status_var,
-                                           values=['Pending', 'Received'],
-                                           state='readonly',
-                                           width=20)
-            status_dropdown.pack(side=tk.LEFT, padx=(0, 10))
-
-            def update_brokerage_status():
-                try:
-                    # Find the row index in the sheet
-                    row_index = next(i for i, row in enumerate(assets[1:], start=2)
-                                     if row[0] == values[0] and row[2] == values[1])
-
-                    # Update the cell in column W (index 22)
-                    self.app.sheet.update_cell(row_index, 23, status_var.get())  # 23 because sheets are 1-indexed
-
-                    messagebox.showinfo("Success", "Brokerage status updated successfully!")
-
-                    # Update the main list view
-                    self.update_asset_list()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to update brokerage status: {str(e)}")
-
-            # Add update button
-            update_button = ttk.Button(status_row,
-                                       text="Update Status",
-                                       style="primary.TButton",
-                                       command=update_brokerage_status)
-            update_button.pack(side=tk.LEFT)
-
-            # Document Details Section
-            doc_frame = ttk.Frame(scrollable_frame, style='DetailRow.TFrame')
-            doc_frame.pack(fill=tk.X, pady=5, padx=10)
-
-            ttk.Label(doc_frame,
-                      text="Document Details",
-                      style='DetailLabel.TLabel',
-                      font=('Segoe UI', 11, 'bold')).pack(anchor=tk.W, pady=(10, 5))
-
-            doc_content_frame = ttk.Frame(doc_frame, style='DetailRow.TFrame')
-            doc_content_frame.pack(fill=tk.X, padx=15)
-
-            # Document columns (X, Y, Z, AA, AB) - indices 23 to 27
-            for i in range(23, 28):
-                row = ttk.Frame(doc_content_frame, style='DetailRow.TFrame')
-                row.pack(fill=tk.X, pady=2)
-
-                header_label = ttk.Label(row,
-                                         text=f"{headers[i]}:",
-                                         style='DetailLabel.TLabel',
-                                         width=20,
-                                         anchor='e')
-                header_label.pack(side=tk.LEFT, padx=(5, 10))
-
-                value = str(full_row[i] or '-')
-                value_label = ttk.Label(row,
-                                        text=value,
-                                        style='DetailValue.TLabel',
-                                        anchor='w')
-
-                if value.upper().strip() not in ["UPLOADED", "NA"] and value.strip():
-                    row.configure(style='Warning.TFrame')
-                    value_label.configure(background=self.colors['warning'])
-
-                value_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-            # Bottom button frame
-            button_frame = ttk.Frame(main_container, style='Content.TFrame')
-            button_frame.pack(fill=tk.X, pady=(15, 0))
-
-            def open_drive_documents():
-                drive_link = full_row[29]  # Column AD contains the Google Drive folder link
-                if drive_link:
-                    response = messagebox.askyesno(
-                        "Open Documents",
-                        "You will be redirected to Google Drive to view the documents. Continue?",
-                        icon='question'
-                    )
-                    if response:
-                        webbrowser.open(drive_link)
-                else:
-                    messagebox.showwarning("No Documents", "No document folder link available for this asset.")
-
-            view_docs_button = ttk.Button(button_frame,
-                                          text="View Documents",
-                                          style="primary.TButton",
-                                          command=open_drive_documents,
-                                          width=15)
-            view_docs_button.pack(side=tk.LEFT, padx=(0, 10))
-
-            close_button = ttk.Button(button_frame,
-                                      text="Close",
-                                      style="primary.TButton",
-                                      command=on_window_close,
-                                      width=15)
-            close_button.pack(side=tk.RIGHT)
-
-            # Set up scrolling
-            canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=(0, 15))
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            canvas.configure(yscrollcommand=scrollbar.set)
+        # Indexed lookup against the cached snapshot; no sheet fetch needed
+        match = self.app.sheet_cache.lookup(values[0], name=values[1])
 
-            self._setup_scroll_bindings(canvas)
-            self._center_window(details_window, 700, 600)
+        if match:
+            self.detail_view.show(*match)
         else:
             messagebox.showerror("Error", "Asset details not found.")
 
+    def _restore_main_scrolling(self):
+        # Restore main window scrolling
+        if hasattr(self.app.main_ui, '_restore_scrolling'):
+            self.app.main_ui._restore_scrolling()
+
+    def show_documents(self, full_row):
+        drive_link = full_row[29]  # Column AD contains the Google Drive folder link
+        self.show_documents_window(drive_link, full_row[4])
+
     def show_documents_window(self, drive_link, property_name, on_window_close=None):
         # Create new window for documents
         docs_window = tk.Toplevel(self.parent)
@@ -475,27 +316,53 @@ class AssetList:
                           style='DetailHeader.TLabel')
         title.pack(side=tk.LEFT)
 
-        # Create listbox for documents with scrollbar
+        # Document list, filled from the Drive folder listing
         docs_frame = ttk.Frame(main_container, style='Card.TFrame')
         docs_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
 
-        # You'll need to implement the logic to fetch documents from Google Drive here
-        # For now, we'll show a message about the drive link
-        info_label = ttk.Label(docs_frame,
-                               text=f"Google Drive Folder Link:\n{drive_link}",
-                               style='DetailValue.TLabel',
-                               wraplength=700)
-        info_label.pack(pady=20)
-
-        # Add information about implementation
-        note_label = ttk.Label(docs_frame,
-                               text="Note: To implement document fetching, you'll need to:\n" +
-                                    "1. Use Google Drive API to fetch documents\n" +
-                                    "2. List PDF files in the drive folder\n" +
-                                    "3. Provide preview/download functionality",
-                               style='DetailValue.TLabel',
-                               wraplength=700)
-        note_label.pack(pady=20)
+        status_label = ttk.Label(docs_frame,
+                                 text="Loading documents…",
+                                 style='DetailValue.TLabel')
+        status_label.pack(anchor=tk.W, pady=(0, 10))
+
+        docs_tree = ttk.Treeview(docs_frame,
+                                 columns=('Document', 'File'),
+                                 show='headings',
+                                 style='Custom.Treeview')
+        docs_tree.heading('Document', text='Document', anchor=tk.W)
+        docs_tree.heading('File', text='File', anchor=tk.W)
+        docs_tree.column('Document', width=220, anchor=tk.W)
+        docs_tree.column('File', width=480, anchor=tk.W)
+        docs_tree.pack(fill=tk.BOTH, expand=True)
+
+        links = {}
+
+        def show_listing(listing):
+            if not docs_tree.winfo_exists():
+                return
+            for entry in listing:
+                item = docs_tree.insert('', tk.END, values=(entry['document'], entry['name']))
+                links[item] = entry['link']
+            status_label.configure(text=f"{len(listing)} document(s). Double-click to open."
+                                   if listing else "No documents in this folder.")
+
+        def show_error(error):
+            if docs_tree.winfo_exists():
+                status_label.configure(text=f"Could not list documents: {str(error)}")
+
+        def open_document(event):
+            selection = docs_tree.selection()
+            if selection and links.get(selection[0]):
+                webbrowser.open(links[selection[0]])
+
+        docs_tree.bind('<Double-1>', open_document)
+
+        folder_id = folder_id_from_link(drive_link)
+        if folder_id:
+            # Usually already warm from the selection prefetch
+            self.app.drive_folders.fetch(folder_id, on_success=show_listing, on_error=show_error)
+        else:
+            status_label.configure(text=f"Google Drive Folder Link:\n{drive_link}")
 
         # Bottom button frame
         button_frame = ttk.Frame(main_container, style='Content.TFrame')
@@ -512,24 +379,118 @@ class AssetList:
         close_button = ttk.Button(button_frame,
                                   text="Close",
                                   style="primary.TButton",
-                                  command=on_window_close,
+                                  command=on_window_close or docs_window.destroy,
                                   width=15)
         close_button.pack(side=tk.RIGHT)
 
         self._center_window(docs_window, 800, 600)
 
     # Rest of the methods remain unchanged
-    def update_asset_list(self):
-        self.asset_list.delete(*self.asset_list.get_children())
-        assets = self.app.sheet.get_all_values()[1:]  # Skip header row
+    def update_asset_list(self, force=False):
+        def load():
+            self.app.sheet_cache.refresh(force=force, columns=self.COLUMNS)
+            return None  # every row
+
+        self._load_assets(load)
+
+    def _reload_current_view(self):
+        if self._filtered:
+            self.search_assets()
+        else:
+            self.update_asset_list()
+
+    def _on_search_changed(self, *args):
+        if self._search_after is not None:
+            self.parent.after_cancel(self._search_after)
+        self._search_after = self.parent.after(self.SEARCH_DEBOUNCE_MS, self.search_assets)
+
+    def search_assets(self):
+        if self._search_after is not None:
+            self.parent.after_cancel(self._search_after)
+            self._search_after = None
+
+        search_term = self.search_var.get().lower().strip()
+        if search_term == "search assets...":
+            return
+        if not search_term:
+            # Clearing the box brings back the full list
+            if self._filtered:
+                self._filtered = False
+                self.update_asset_list()
+            return
+
+        try:
+            query = compile_query(search_term)
+        except FilterQueryError as e:
+            self.loading_label.configure(text=str(e))
+            return
+
+        if query.clauses:
+            # Structured filters such as "location:gurgaon expiry<90d"
+            def load():
+                cache = self.app.sheet_cache
+                index = cache.search_index() if query.terms else None
+                return query.run(cache.column_store(), index)
+
+            self._filtered = True
+            self._load_assets(load)
+            return
+
+        def load():
+            # Answered from the in-memory index over the current snapshot
+            cache = self.app.sheet_cache
+            index = cache.search_index()
+            row_numbers = index.search(search_term)
+
+            # Close misspellings follow the exact matches, most similar first
+            exact = set(row_numbers)
+            row_numbers += [row_number for row_number, score
+                            in index.fuzzy_search(search_term, self.FUZZY_THRESHOLD)
+                            if row_number not in exact]
+            return row_numbers
+
+        self._filtered = True
+        self._load_assets(load)
+
+    def _load_assets(self, load):
+        noncompliant_only = self.noncompliant_only.get()
+
+        def select():
+            # ``load`` returns sheet row numbers, or None for the whole sheet
+            row_numbers = load()
+            store = self.app.sheet_cache.column_store()
+            if row_numbers is None:
+                positions = range(len(store))
+            else:
+                positions = [n - 2 for n in row_numbers if 2 <= n < len(store) + 2]
+            if noncompliant_only:
+                positions = [p for p in positions if store.missing_docs[p]]
+            return store, positions
+
+        # A newer refresh or search supersedes whatever is still in flight
+        self.loader.load(select, self._on_assets_loaded)
+
+    def _on_assets_loaded(self, result):
+        self._view = result
+        self._render_view()
+
+    def _render_view(self):
+        if self._view is None:
+            return
+        store, positions = self._view
+        positions = self.sorter.apply(store, positions)
 
         # Configure warning background tag
         self.asset_list.tag_configure('warning', background=self.colors['warning'])
         self.asset_list.tag_configure('evenrow', background=self.colors['background'])
         self.asset_list.tag_configure('selected_warning', background='#ffcdd2')  # Darker warning color for selection
 
+        self.compliance_label.configure(text="Missing documents — " + " · ".join(
+            f"{header}: {count}" for header, count in zip(store.document_headers, store.missing_counts)))
 
-        for i, row in enumerate(assets):
+        rows = []
+        for position in positions:
+            row = store.rows[position]
             values = [
                 row[0],  # Asset ID
                 row[2],  # Property Name
@@ -543,64 +504,18 @@ class AssetList:
                 row[28]  # Column AC
             ]
 
-            # Check document status in columns X, Y, Z, AA, AB (indices 23-27)
-            needs_warning = False
-            for idx in range(23, 28):
-                status = str(row[idx]).upper().strip()
-                # If status is empty OR not "UPLOADED" or "NA", mark for warning
-                if not status or (status not in ["UPLOADED", "NA"]):
-                    needs_warning = True
-                    break
-
-            # Insert the row
-            item = self.asset_list.insert('', tk.END, values=values)
-
-            # Apply warning tag if needed, otherwise apply evenrow tag for alternating rows
-            if needs_warning:
-                self.asset_list.item(item, tags=('warning',))
-            elif i % 2 == 0:
-                self.asset_list.item(item, tags=('evenrow',))
-
-    def search_assets(self):
-        search_term = self.search_var.get().lower()
-        if search_term == "search assets...":
-            return
+            # Any document in X-AB not UPLOADED or NA (precomputed per snapshot)
+            if store.missing_docs[position]:
+                tags = ('warning',)
+            elif store.row_numbers[position] % 2 == 0:
+                # Striped by sheet row, not display position, so an insert or
+                # delete does not retag (and re-send) every row below it
+                tags = ('evenrow',)
+            else:
+                tags = ()
+            rows.append((values, tags))
 
-        self.asset_list.delete(*self.asset_list.get_children())
-        assets = self.app.sheet.get_all_values()[1:]
-
-        for i, row in enumerate(assets):
-            if any(search_term in str(value).lower() for value in row):
-                values = [
-                    row[0],  # Asset ID
-                    row[2],  # Property Name
-                    row[3],  # Location
-                    row[4],  # Column E
-                    row[5],  # Column F
-                    row[6],  # Category
-                    row[10],  # Column K
-                    row[11],  # Status
-                    row[12],  # Column M
-                    row[28]  # Column AC
-                ]
-
-                # Check document status in columns X, Y, Z, AA, AB (indices 23-27)
-                needs_warning = False
-                for idx in range(23, 28):
-                    status = str(row[idx]).upper().strip()
-                    # If status is empty OR not "UPLOADED" or "NA", mark for warning
-                    if not status or (status not in ["UPLOADED", "NA"]):
-                        needs_warning = True
-                        break
-
-                # Insert the row
-                item = self.asset_list.insert('', tk.END, values=values)
-
-                # Apply warning tag if needed, otherwise apply evenrow tag
-                if needs_warning:
-                    self.asset_list.item(item, tags=('warning',))
-                elif i % 2 == 0:
-                    self.asset_list.item(item, tags=('evenrow',))
+        self.loader.show_rows(rows)
 
     def on_hover(self, event):
         region = self.asset_list.identify_region(event.x, event.y)
@@ -609,6 +524,40 @@ class AssetList:
         else:
             self.asset_list.configure(cursor="")
 
+        # Resting on a row warms it as well
+        item = self.asset_list.identify_row(event.y)
+        if item and item != self._hover_item:
+            self._hover_item = item
+            self._schedule_prefetch(item)
+
+    def on_selection_changed(self, event):
+        selection = self.asset_list.selection()
+        if selection:
+            self._schedule_prefetch(selection[0])
+
+    def _schedule_prefetch(self, item):
+        # Only the row the user settles on is prefetched
+        if self._prefetch_after is not None:
+            self.parent.after_cancel(self._prefetch_after)
+        self._prefetch_after = self.parent.after(self.PREFETCH_DWELL_MS, self._prefetch, item)
+
+    def _prefetch(self, item):
+        self._prefetch_after = None
+        if not self.asset_list.exists(item) or not self.app.sheet_cache.loaded:
+            return
+        values = self.asset_list.item(item, 'values')
+        if not values:
+            return
+
+        # The detail row is in memory; build the detail window and warm the Drive listing
+        match = self.app.sheet_cache.lookup(values[0], name=values[1])
+        if match is None:
+            return
+        self.detail_view.prepare()
+        full_row = match[1]
+        if len(full_row) > 29:
+            self.app.drive_folders.prefetch(folder_id_from_link(full_row[29]))
+
     def on_treeview_double_click(self, event):
         selected_item = self.asset_list.selection()
         if selected_item:
@@ -629,32 +578,7 @@ class AssetList:
         else:
             return
 
-        self.asset_list.yview_scroll(move, "units")
-
-    def _setup_scroll_bindings(self, canvas):
-        """Setup scrolling for detail window canvas"""
-
-        def _bind_to_mousewheel(event):
-            canvas.bind_all("<MouseWheel>", _on_mousewheel)
-            canvas.bind_all("<Button-4>", _on_mousewheel)
-            canvas.bind_all("<Button-5>", _on_mousewheel)
-
-        def _unbind_from_mousewheel(event=None):  # Made event optional
-            canvas.unbind_all("<MouseWheel>")
-            canvas.unbind_all("<Button-4>")
-            canvas.unbind_all("<Button-5>")
-
-        def _on_mousewheel(event):
-            if event.num == 4 or event.delta > 0:
-                canvas.yview_scroll(-1, "units")
-            elif event.num == 5 or event.delta < 0:
-                canvas.yview_scroll(1, "units")
-
-        canvas.bind('<Enter>', _bind_to_mousewheel)
-        canvas.bind('<Leave>', _unbind_from_mousewheel)
-
-        # Add this: ensure bindings are cleaned up when window is closed
-        canvas.winfo_toplevel().bind('<Destroy>', _unbind_from_mousewheel)
+        self.loader.scroll(move)
 
     def _center_window(self, window, width, height):
         # Get screen dimensions
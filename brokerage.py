@@ -4,16 +4,21 @@ from ttkbootstrap import Style
 import datetime
 from dateutil.parser import parse
 from tkinter import ttk, messagebox  # Added messagebox import
-import webbrowser
+from detail_view import AssetDetailView
+from tree_views import ColumnSorter, TreeLoader
 
 
 
 class BrokerageManagement:
+    # Columns behind the brokerage table and its status counts
+    COLUMNS = ("A", "E", "K:M", "T:U", "W", "AC")
+
     def __init__(self, parent, app):
         self.status_colors = None
         self.colors = None
         self.parent = parent
         self.app = app
+        self._view = None
         self.style = Style(theme='flatly')
         self.selected_status = tk.StringVar(value="All")
         self.selected_period = tk.StringVar(value="All Time")
@@ -156,9 +161,16 @@ class BrokerageManagement:
         refresh_button = ttk.Button(control_frame,
                                     text="⟳ Refresh",
                                     style='Refresh.TButton',
-                                    command=self.refresh_brokerage_data)
+                                    command=lambda: self.refresh_brokerage_data(force=True))
         refresh_button.pack(side=tk.LEFT, padx=(0, 10))
 
+        self.loading_label = ttk.Label(control_frame,
+                                       text="",
+                                       font=('Segoe UI', 10),
+                                       foreground=self.colors['text_secondary'],
+                                       background=self.colors['surface'])
+        self.loading_label.pack(side=tk.LEFT)
+
         # Add status indicators legend
         legend_frame = ttk.Frame(container, style='Filter.TFrame')
         legend_frame.pack(fill=tk.X, padx=20, pady=10)
@@ -224,11 +236,17 @@ class BrokerageManagement:
             self.tree.heading(col, text=col, anchor=tk.W)
             self.tree.column(col, width=col_widths[col], minwidth=col_widths[col])
 
+        # Headings sort on the typed sheet columns, not the displayed text
+        self.sorter = ColumnSorter(self.tree,
+                                   dict(zip(columns, [0, 4, 10, 11, 12, 19, 20, 22, 28])),
+                                   self._render_view)
+
         # Enhanced scrollbar
         scrollbar = ttk.Scrollbar(tree_frame,
                                   orient="vertical",
                                   command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
+        self.loader = TreeLoader(self.tree, scrollbar, self.app.io, self.loading_label, "brokerage data")
 
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -241,6 +259,20 @@ class BrokerageManagement:
                                 background=self.status_colors['pending'],
                                 foreground=self.status_colors['pending_text'])
 
+        # Opened on double-click; the same window is refilled for each asset
+        self.detail_view = AssetDetailView(self.parent, self.app, self.colors,
+                                           groups={
+                                               'Basic Info': [0, 1, 2, 3, 4, 5],
+                                               'Property Details': [6, 7, 8, 9, 10],
+                                               'Unit Information': [11, 12, 13, 14, 15],
+                                               'Tenant Details': [16, 17, 18, 19, 20],
+                                               'Brokerage Information': [21, 22, 23]
+                                           },
+                                           show_brokerage=True,
+                                           brokerage_title="Update Brokerage Status",
+                                           show_documents=False,
+                                           on_status_updated=self.refresh_brokerage_data)
+
         status_dropdown.bind('<<ComboboxSelected>>', lambda e: self.refresh_brokerage_data())
         self.tree.bind('<Double-1>', self.on_treeview_double_click)
         self.tree.bind('<Motion>', self.on_hover)
@@ -250,190 +282,13 @@ class BrokerageManagement:
         self.refresh_brokerage_data()
 
     def show_asset_details(self, values):
-        # Find the full asset data from the sheet
-        assets = self.app.sheet.get_all_values()
-        headers = assets[0]
-
         # Match based on multiple columns to ensure correct asset
-        full_row = next((row for row in assets[1:]
-                         if row[0] == values[0]  # S.No
-                         and row[4] == values[1]  # Project
-                         and row[10] == values[2]), None)  # Tower
-
-        if full_row:
-            details_window = tk.Toplevel(self.parent)
-            details_window.title("Asset Details")
-            details_window.geometry("700x600")
-            details_window.minsize(700, 600)
-
-            def on_window_close():
-                canvas.unbind_all("<MouseWheel>")
-                canvas.unbind_all("<Button-4>")
-                canvas.unbind_all("<Button-5>")
-                details_window.destroy()
-
-            details_window.protocol("WM_DELETE_WINDOW", on_window_close)
-
-            # Main container
-            main_container = ttk.Frame(details_window, style='Card.TFrame')
-            main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-
-            # Header with property name and asset ID
-            header_frame = ttk.Frame(main_container, style='DetailHeader.TFrame')
-            header_frame.pack(fill=tk.X, pady=(0, 15))
-
-            header_content = ttk.Frame(header_frame, style='DetailHeader.TFrame', padding=(15, 10))
-            header_content.pack(fill=tk.X)
-
-            title = ttk.Label(header_content,
-                              text=f"{full_row[4]}",  # Project name
-                              style='DetailHeader.TLabel')
-            title.pack(side=tk.LEFT)
-
-            asset_id = ttk.Label(header_content,
-                                 text=f"ID: {full_row[0]}",
-                                 style='DetailHeader.TLabel')
-            asset_id.pack(side=tk.RIGHT)
-
-            # Create content area with canvas for scrolling
-            content_frame = ttk.Frame(main_container, style='Card.TFrame')
-            content_frame.pack(fill=tk.BOTH, expand=True)
-
-            canvas = tk.Canvas(content_frame,
-                               bg=self.colors['surface'],
-                               highlightthickness=0)
-            scrollbar = ttk.Scrollbar(content_frame,
-                                      orient="vertical",
-                                      command=canvas.yview)
-            scrollable_frame = ttk.Frame(canvas, style='Content.TFrame')
-
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-            )
-
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw", width=canvas.winfo_width())
-            canvas.bind('<Configure>', lambda e: canvas.itemconfig(canvas.find_all()[0], width=e.width))
-
-            # Content groups
-            groups = {
-                'Basic Info': [0, 1, 2, 3, 4, 5],
-                'Property Details': [6, 7, 8, 9, 10],
-                'Unit Information': [11, 12, 13, 14, 15],
-                'Tenant Details': [16, 17, 18, 19, 20],
-                'Brokerage Information': [21, 22, 23]
-            }
-
-            # Add groups
-            for group_name, field_indices in groups.items():
-                group_frame = ttk.Frame(scrollable_frame, style='DetailRow.TFrame')
-                group_frame.pack(fill=tk.X, pady=5, padx=10)
-
-                ttk.Label(group_frame,
-                          text=group_name,
-                          style='DetailLabel.TLabel',
-                          font=('Segoe UI', 11, 'bold')).pack(anchor=tk.W, pady=(10, 5))
-
-                content_frame = ttk.Frame(group_frame, style='DetailRow.TFrame')
-                content_frame.pack(fill=tk.X, padx=15)
-
-                for idx in field_indices:
-                    if idx < len(headers) and idx < len(full_row):
-                        row = ttk.Frame(content_frame, style='DetailRow.TFrame')
-                        row.pack(fill=tk.X, pady=2)
-
-                        header_label = ttk.Label(row,
-                                                 text=f"{headers[idx]}:",
-                                                 style='DetailLabel.TLabel',
-                                                 width=20,
-                                                 anchor='e')
-                        header_label.pack(side=tk.LEFT, padx=(5, 10))
-
-                        value_label = ttk.Label(row,
-                                                text=str(full_row[idx] or '-'),
-                                                style='DetailValue.TLabel',
-                                                anchor='w')
-                        value_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-            # Brokerage Status Update Section
-            status_frame = ttk.Frame(scrollable_frame, style='DetailRow.TFrame')
-            status_frame.pack(fill=tk.X, pady=5, padx=10)
-
-            ttk.Label(status_frame,
-                      text="Update Brokerage Status",
-                      style='DetailLabel.TLabel',
-                      font=('Segoe UI', 11, 'bold')).pack(anchor=tk.W, pady=(10, 5))
-
-            status_content = ttk.Frame(status_frame, style='DetailRow.TFrame')
-            status_content.pack(fill=tk.X, padx=15)
-
-            # Status dropdown
-            status_var = tk.StringVar(value=full_row[22] or 'Pending')
-            status_dropdown = ttk.Combobox(status_content,
-                                           textvariable=status_var,
-                                           values=['Pending', 'Received'],
-                                           state='readonly',
-                                           width=20)
-            status_dropdown.pack(side=tk.LEFT, padx=(0, 10))
-
-            def update_brokerage_status():
-                try:
-                    # Find the row index in the sheet
-                    row_index = next(i for i, row in enumerate(assets[1:], start=2)
-                                     if row[0] == values[0])
-
-                    # Update the cell in column W (index 22)
-                    self.app.sheet.update_cell(row_index, 23, status_var.get())
-                    messagebox.showinfo("Success", "Brokerage status updated successfully!")
-                    self.refresh_brokerage_data()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to update brokerage status: {str(e)}")
-
-            update_button = ttk.Button(status_content,
-                                       text="Update Status",
-                                       style="primary.TButton",
-                                       command=update_brokerage_status)
-            update_button.pack(side=tk.LEFT)
-
-            # Bottom button frame
-            button_frame = ttk.Frame(main_container, style='Content.TFrame')
-            button_frame.pack(fill=tk.X, pady=(15, 0))
-
-            # View documents button
-            def open_drive_documents():
-                drive_link = full_row[29]  # Google Drive folder link
-                if drive_link:
-                    response = messagebox.askyesno(
-                        "Open Documents",
-                        "You will be redirected to Google Drive to view the documents. Continue?",
-                        icon='question'
-                    )
-                    if response:
-                        webbrowser.open(drive_link)
-                else:
-                    messagebox.showwarning("No Documents", "No document folder link available for this asset.")
-
-            view_docs_button = ttk.Button(button_frame,
-                                          text="View Documents",
-                                          style="primary.TButton",
-                                          command=open_drive_documents,
-                                          width=15)
-            view_docs_button.pack(side=tk.LEFT, padx=(0, 10))
-
-            close_button = ttk.Button(button_frame,
-                                      text="Close",
-                                      style="primary.TButton",
-                                      command=on_window_close,
-                                      width=15)
-            close_button.pack(side=tk.RIGHT)
-
-            # Set up scrolling
-            canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=(0, 15))
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            canvas.configure(yscrollcommand=scrollbar.set)
-
-            self._setup_scroll_bindings(canvas)
-            self._center_window(details_window, 700, 600)
+        match = next(((row_index, row) for row_index, row in self.app.sheet_cache.lookup_all(values[0])  # S.No
+                      if row[4] == values[1]  # Project
+                      and row[10] == values[2]), None)  # Tower
+
+        if match:
+            self.detail_view.show(*match)
         else:
             messagebox.showerror("Error", "Asset details not found.")
 
@@ -451,55 +306,29 @@ class BrokerageManagement:
         else:
             self.tree.configure(cursor="")
 
-    def _setup_scroll_bindings(self, canvas):
-        def _bind_to_mousewheel(event):
-            canvas.bind_all("<MouseWheel>", _on_mousewheel)
-            canvas.bind_all("<Button-4>", _on_mousewheel)
-            canvas.bind_all("<Button-5>", _on_mousewheel)
-
-        def _unbind_from_mousewheel(event=None):
-            canvas.unbind_all("<MouseWheel>")
-            canvas.unbind_all("<Button-4>")
-            canvas.unbind_all("<Button-5>")
-
-        def _on_mousewheel(event):
-            if event.num == 4 or event.delta > 0:
-                canvas.yview_scroll(-1, "units")
-            elif event.num == 5 or event.delta < 0:
-                canvas.yview_scroll(1, "units")
-
-        canvas.bind('<Enter>', _bind_to_mousewheel)
-        canvas.bind('<Leave>', _unbind_from_mousewheel)
-        canvas.winfo_toplevel().bind('<Destroy>', _unbind_from_mousewheel)
-
-    def _center_window(self, window, width, height):
-        screen_width = window.winfo_screenwidth()
-        screen_height = window.winfo_screenheight()
-        x = (screen_width - width) // 2
-        y = (screen_height - height) // 2
-        window.geometry(f"{width}x{height}+{x}+{y}")
+    def refresh_brokerage_data(self, force=False):
+        selected_status = self.selected_status.get()
 
+        def load():
+            self.app.sheet_cache.refresh(force=force, columns=self.COLUMNS)
+            store = self.app.sheet_cache.column_store()
+            by_status = store.indexes['brokerage']
+            status_counts = {status: len(positions) for status, positions in by_status.items()}
+            if selected_status == "All":
+                positions = range(len(store))
+            else:
+                positions = sorted(by_status.get(selected_status.lower(), ()))
+            return status_counts, store, positions
 
+        self.loader.load(load, self._on_brokerage_loaded)
 
-    def refresh_brokerage_data(self):
-        self.tree.delete(*self.tree.get_children())
-        all_rows = self.app.sheet.get_all_values()
+    def _on_brokerage_loaded(self, result):
+        status_counts, store, positions = result
 
-        # Calculate total statistics
-        total_assets = len(all_rows[1:])
-        total_received = 0
-        total_pending = 0
-
-        # First pass for statistics
-        for row in all_rows[1:]:
-            try:
-                status = row[22].lower() if row[22] else "pending"
-                if status == "received":
-                    total_received += 1
-                elif status == "pending":
-                    total_pending += 1
-            except (ValueError, IndexError):
-                continue
+        # Calculate total statistics from the indexed status column
+        total_assets = sum(status_counts.values())
+        total_received = status_counts.get("received", 0)
+        total_pending = status_counts.get("pending", 0)
 
         # Calculate percentage
         received_percentage = (total_received / total_assets * 100) if total_assets > 0 else 0
@@ -510,30 +339,40 @@ class BrokerageManagement:
         self.stat_labels["pending_count"].configure(text=str(total_pending))
         self.stat_labels["received_percentage"].configure(text=f"{received_percentage:.1f}%")
 
+        self._view = (store, positions)
+        self._render_view()
+
+    def _render_view(self):
+        if self._view is None:
+            return
+        store, positions = self._view
+
         # Populate TreeView with filtered data
-        for row in all_rows[1:]:
+        tree_rows = []
+        for position in self.sorter.apply(store, positions):
+            row = store.rows[position]
             try:
                 status = row[22].lower() if row[22] else "pending"
 
-                if self.selected_status.get() == "All" or status.lower() == self.selected_status.get().lower():
-                    values = [
-                        row[0],   # S.No
-                        row[4],   # Project
-                        row[10],  # Tower
-                        row[11],  # Floor
-                        row[12],  # Unit No
-                        row[19],  # Owner Name
-                        row[20],  # Tenant (Column U)
-                        row[22] if row[22] else "Pending",  # Brokerage
-                        row[28],  # Lease Manager
-                    ]
-
-                    item = self.tree.insert("", "end", values=values)
-                    self.tree.item(item, tags=(status,))
+                values = [
+                    row[0],   # S.No
+                    row[4],   # Project
+                    row[10],  # Tower
+                    row[11],  # Floor
+                    row[12],  # Unit No
+                    row[19],  # Owner Name
+                    row[20],  # Tenant (Column U)
+                    row[22] if row[22] else "Pending",  # Brokerage
+                    row[28],  # Lease Manager
+                ]
+
+                tree_rows.append((values, (status,)))
 
             except (ValueError, IndexError):
                 continue
 
+        self.loader.show_rows(tree_rows)
+
     def _on_mousewheel(self, event):
         if event.delta:
             move = -1 * (event.delta // 120)
@@ -544,4 +383,4 @@ class BrokerageManagement:
         else:
             return
 
-        self.tree.yview_scroll(move, "units")
\ No newline at end of file
+        self.loader.scroll(move)
\ No newline at end of file
@@ -0,0 +1,248 @@
+import re
+import heapq
+from bisect import bisect_right
+from sheet_dates import date_ordinal
+
+# Query field name -> sheet column index
+FIELDS = {
+    'id': 0,
+    'name': 2,
+    'location': 3,
+    'project': 4,
+    'tower': 10,
+    'floor': 11,
+    'unit': 12,
+    'expiry': 14,
+    'owner': 19,
+    'tenant': 20,
+    'brokerage': 22,
+    'manager': 28,
+}
+
+# Document status columns X-AB; a document is in order when UPLOADED or NA
+DOCUMENT_COLUMNS = range(23, 28)
+COMPLIANT_STATUSES = ('UPLOADED', 'NA')
+
+# Headers of the date columns, as MainUI writes them
+DATE_HEADERS = ("Date ", "commenment Date", "Lease Expiry", "Lock in expiry")
+
+# Short names for the date columns in timeline views
+DATE_LABELS = {
+    "Date ": "Date",
+    "commenment Date": "Commencement",
+    "Lease Expiry": "Lease Expiry",
+    "Lock in expiry": "Lock-in Expiry",
+}
+
+DIGITS_RE = re.compile(r'(\d+)')
+
+
+def _cell(row, idx):
+    return row[idx] if idx < len(row) else ''
+
+
+def missing_documents(row):
+    """Bitmask of the row's documents (bit k -> column 23 + k) not UPLOADED or NA"""
+    mask = 0
+    for bit, idx in enumerate(DOCUMENT_COLUMNS):
+        if _cell(row, idx).strip().upper() not in COMPLIANT_STATUSES:
+            mask |= 1 << bit
+    return mask
+
+
+def _date_keys(cells):
+    """Date ordinals for ``cells`` plus the positions of cells that are not dates"""
+    keys = []
+    failures = []
+    for position, text in enumerate(cells):
+        try:
+            keys.append(date_ordinal(text))
+        except ValueError:
+            keys.append(None)
+            failures.append(position)
+    return keys, failures
+
+
+def natural_key(text):
+    """Sort key that orders "Unit 9" before "Unit 10"; None for blanks"""
+    text = text.strip().lower()
+    if not text:
+        return None
+    parts = DIGITS_RE.split(text)
+    parts[1::2] = [int(part) for part in parts[1::2]]
+    return parts
+
+
+class ExpiryIndex:
+    """Rows with a readable lease expiry, sorted by (ordinal, position).
+
+    Every Reminders window is a contiguous slice of this order, so it is
+    found with two bisects and comes out already soonest-first.
+    """
+
+    def __init__(self, expiry):
+        pairs = sorted((ordinal, position) for position, ordinal in enumerate(expiry)
+                       if ordinal is not None)
+        self.ordinals = [ordinal for ordinal, _ in pairs]
+        self.positions = [position for _, position in pairs]
+
+    def bound(self, ordinal):
+        """Index of the first entry expiring after ``ordinal``"""
+        return bisect_right(self.ordinals, ordinal)
+
+    def between(self, first, last):
+        """Slice bounds of entries with first < expiry <= last"""
+        return self.bound(first), self.bound(last)
+
+    def __len__(self):
+        return len(self.ordinals)
+
+
+class TimelineIndex:
+    """Every dated event in a snapshot, across all date columns.
+
+    Built in one pass per snapshot: each date column contributes
+    (ordinal, position, column) entries, kept both merged and per column
+    in date order. A range query is then a pair of bisects per column, so
+    more date columns add build time but no query time.
+    """
+
+    def __init__(self, store):
+        self.labels = {}
+        self.by_column = {}
+        for idx in sorted(store.date_columns):
+            header = _cell(store.headers, idx)
+            self.labels[idx] = DATE_LABELS.get(header, header.strip() or "Lease Expiry")
+            entries = sorted((ordinal, position, idx)
+                             for position, ordinal in enumerate(store.sort_keys(idx))
+                             if ordinal is not None)
+            self.by_column[idx] = ([entry[0] for entry in entries], entries)
+        self.entries = list(heapq.merge(*(entries for _, entries in self.by_column.values())))
+        self.ordinals = [entry[0] for entry in self.entries]
+
+    def between(self, first, last, columns=None):
+        """(ordinal, position, column) entries with first < date <= last, soonest first.
+
+        ``columns`` limits the query to some date columns; None means all.
+        """
+        if columns is None:
+            return self.entries[bisect_right(self.ordinals, first):bisect_right(self.ordinals, last)]
+        slices = []
+        for idx in columns:
+            if idx in self.by_column:
+                ordinals, entries = self.by_column[idx]
+                slices.append(entries[bisect_right(ordinals, first):bisect_right(ordinals, last)])
+        return list(heapq.merge(*slices))
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ColumnStore:
+    """Column-oriented, typed copy of one sheet snapshot.
+
+    Each query field becomes a list of lowercased strings indexed by row
+    position, lease expiry is also kept as date ordinals (positions whose
+    text is not a date are listed in ``expiry_failures``), and a few
+    low-cardinality columns get value -> positions indexes. Built once per
+    snapshot version and shared by everything that filters rows.
+
+    Document compliance is folded into one small int per row: bit k of
+    ``missing_docs`` is set when document column 23 + k is neither
+    UPLOADED nor NA, blank included.
+    """
+
+    # Fields answered from a value index rather than a scan
+    INDEXED = ('id', 'brokerage', 'status')
+
+    def __init__(self, values, version, headers=None):
+        rows = values[1:] if values else []
+        self.version = version
+        self.rows = rows
+        self.row_numbers = list(range(2, len(rows) + 2))
+
+        self.text = {field: [_cell(row, idx).strip().lower() for row in rows]
+                     for field, idx in FIELDS.items()}
+        # Blank brokerage counts as pending, as everywhere else in the app
+        self.text['brokerage'] = [value or 'pending' for value in self.text['brokerage']]
+        self.text['status'] = ['occupied' if tenant else 'vacant' for tenant in self.text['tenant']]
+
+        # Unreadable expiry cells are kept as None and listed, not dropped
+        self.expiry, self.expiry_failures = _date_keys(
+            [_cell(row, FIELDS['expiry']) for row in rows])
+
+        self.indexes = {}
+        for field in self.INDEXED:
+            index = self.indexes[field] = {}
+            for position, value in enumerate(self.text[field]):
+                index.setdefault(value, set()).add(position)
+
+        # ``headers`` is the sheet's full header row; values[0] when not given
+        if headers is None:
+            headers = values[0] if values else []
+        self.headers = headers
+        self.document_headers = [_cell(headers, idx) for idx in DOCUMENT_COLUMNS]
+        self.missing_docs = [missing_documents(row) for row in rows]
+        self.missing_counts = [sum(1 for mask in self.missing_docs if mask & (1 << bit))
+                               for bit in range(len(DOCUMENT_COLUMNS))]
+
+        self.date_columns = {idx for idx, header in enumerate(headers) if header in DATE_HEADERS}
+        self.date_columns.add(FIELDS['expiry'])
+        self._sort_keys = {}
+        self._permutations = {}
+        self._ranks = {}
+        self._expiry_index = None
+        self._timeline = None
+
+    def expiry_index(self):
+        """The ExpiryIndex for this snapshot, built on first use"""
+        if self._expiry_index is None:
+            self._expiry_index = ExpiryIndex(self.expiry)
+        return self._expiry_index
+
+    def timeline(self):
+        """The TimelineIndex over every date column, built on first use"""
+        if self._timeline is None:
+            self._timeline = TimelineIndex(self)
+        return self._timeline
+
+    def sort_keys(self, idx):
+        """Typed sort keys for sheet column ``idx``: date ordinals or natural-sort keys"""
+        keys = self._sort_keys.get(idx)
+        if keys is None:
+            if idx == FIELDS['expiry']:
+                keys = self.expiry
+            elif idx in self.date_columns:
+                keys, _ = _date_keys([_cell(row, idx) for row in self.rows])
+            else:
+                keys = [natural_key(_cell(row, idx)) for row in self.rows]
+            self._sort_keys[idx] = keys
+        return keys
+
+    def permutation(self, idx, descending=False):
+        """Row positions ordered by column ``idx``; blanks always sort last"""
+        perm = self._permutations.get((idx, descending))
+        if perm is None:
+            keys = self.sort_keys(idx)
+            present = [position for position, key in enumerate(keys) if key is not None]
+            blank = [position for position, key in enumerate(keys) if key is None]
+            perm = sorted(present, key=keys.__getitem__, reverse=descending) + blank
+            self._permutations[(idx, descending)] = perm
+        return perm
+
+    def sort(self, positions, idx, descending=False):
+        """Order a subset of row positions using the cached permutation"""
+        perm = self.permutation(idx, descending)
+        if len(positions) == len(perm):
+            return list(perm)
+
+        rank = self._ranks.get((idx, descending))
+        if rank is None:
+            rank = [0] * len(perm)
+            for order, position in enumerate(perm):
+                rank[position] = order
+            self._ranks[(idx, descending)] = rank
+        return sorted(positions, key=rank.__getitem__)
+
+    def __len__(self):
+        return len(self.row_numbers)
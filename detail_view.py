@@ -0,0 +1,294 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+import webbrowser
+from column_store import missing_documents, DOCUMENT_COLUMNS
+
+
+class AssetDetailView:
+    """Reusable asset detail window.
+
+    The Toplevel and all of its labels are built the first time an asset is
+    shown (or ahead of time by prepare()). Later calls to show() only update
+    label text from the cached row, and closing the window hides it rather
+    than destroying it, so each tab keeps one window for the whole session.
+    """
+
+    def __init__(self, parent, app, colors, groups, show_brokerage=False,
+                 brokerage_title="Brokerage Status", show_documents=True,
+                 on_status_updated=None, on_view_documents=None, on_close=None):
+        self.parent = parent
+        self.app = app
+        self.colors = colors
+        self.groups = groups
+        self.show_brokerage = show_brokerage
+        self.brokerage_title = brokerage_title
+        self.show_documents = show_documents
+        self.on_status_updated = on_status_updated
+        self.on_view_documents = on_view_documents
+        self.on_close = on_close
+
+        self.window = None
+        self.row_index = None
+        self.full_row = None
+        self.field_labels = {}    # column index -> (header label, value label)
+        self.document_rows = {}   # column index -> (row frame, header label, value label)
+
+    def prepare(self):
+        """Build the (hidden) window ahead of the first show()"""
+        if self.window is None or not self.window.winfo_exists():
+            self._build()
+            self.window.withdraw()
+
+    def show(self, row_index, full_row):
+        if self.window is None or not self.window.winfo_exists():
+            self._build()
+
+        self.row_index = row_index
+        self.full_row = full_row
+        self._populate()
+
+        self.canvas.yview_moveto(0)
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_set()
+
+    def _build(self):
+        self.window = tk.Toplevel(self.parent)
+        self.window.title("Asset Details")
+        self.window.minsize(700, 600)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.field_labels = {}
+        self.document_rows = {}
+
+        # Main container
+        main_container = ttk.Frame(self.window, style='Card.TFrame')
+        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        # Header with property name and asset ID
+        header_frame = ttk.Frame(main_container, style='DetailHeader.TFrame')
+        header_frame.pack(fill=tk.X, pady=(0, 15))
+
+        header_content = ttk.Frame(header_frame, style='DetailHeader.TFrame', padding=(15, 10))
+        header_content.pack(fill=tk.X)
+
+        self.title_label = ttk.Label(header_content, style='DetailHeader.TLabel')
+        self.title_label.pack(side=tk.LEFT)
+
+        self.id_label = ttk.Label(header_content, style='DetailHeader.TLabel')
+        self.id_label.pack(side=tk.RIGHT)
+
+        # Create content area with canvas for scrolling
+        content_frame = ttk.Frame(main_container, style='Card.TFrame')
+        content_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.canvas = tk.Canvas(content_frame,
+                                bg=self.colors['surface'],
+                                highlightthickness=0)
+        scrollbar = ttk.Scrollbar(content_frame,
+                                  orient="vertical",
+                                  command=self.canvas.yview)
+        scrollable_frame = ttk.Frame(self.canvas, style='Content.TFrame')
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        )
+
+        window_id = self.canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        self.canvas.bind('<Configure>', lambda e: self.canvas.itemconfig(window_id, width=e.width))
+
+        # Field groups
+        for group_name, field_indices in self.groups.items():
+            group_content = self._section(scrollable_frame, group_name)
+            for idx in field_indices:
+                row = ttk.Frame(group_content, style='DetailRow.TFrame')
+                row.pack(fill=tk.X, pady=2)
+                self.field_labels[idx] = self._field(row)
+
+        if self.show_brokerage:
+            self._build_brokerage(scrollable_frame)
+
+        if self.show_documents:
+            doc_content = self._section(scrollable_frame, "Document Details")
+            # Document columns (X, Y, Z, AA, AB) - indices 23 to 27
+            for idx in DOCUMENT_COLUMNS:
+                row = ttk.Frame(doc_content, style='DetailRow.TFrame')
+                row.pack(fill=tk.X, pady=2)
+                self.document_rows[idx] = (row,) + self._field(row)
+
+        # Bottom button frame
+        button_frame = ttk.Frame(main_container, style='Content.TFrame')
+        button_frame.pack(fill=tk.X, pady=(15, 0))
+
+        view_docs_button = ttk.Button(button_frame,
+                                      text="View Documents",
+                                      style="primary.TButton",
+                                      command=self.open_drive_documents,
+                                      width=15)
+        view_docs_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        close_button = ttk.Button(button_frame,
+                                  text="Close",
+                                  style="primary.TButton",
+                                  command=self.close,
+                                  width=15)
+        close_button.pack(side=tk.RIGHT)
+
+        # Set up scrolling
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=(0, 15))
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+
+        self.canvas.bind('<Enter>', self._bind_mousewheel)
+        self.canvas.bind('<Leave>', self._unbind_mousewheel)
+        self._center(700, 600)
+
+    def _section(self, parent, title):
+        frame = ttk.Frame(parent, style='DetailRow.TFrame')
+        frame.pack(fill=tk.X, pady=5, padx=10)
+
+        ttk.Label(frame,
+                  text=title,
+                  style='DetailLabel.TLabel',
+                  font=('Segoe UI', 11, 'bold')).pack(anchor=tk.W, pady=(10, 5))
+
+        content = ttk.Frame(frame, style='DetailRow.TFrame')
+        content.pack(fill=tk.X, padx=15)
+        return content
+
+    def _field(self, row):
+        header_label = ttk.Label(row,
+                                 style='DetailLabel.TLabel',
+                                 width=20,
+                                 anchor='e')
+        header_label.pack(side=tk.LEFT, padx=(5, 10))
+
+        value_label = ttk.Label(row,
+                                style='DetailValue.TLabel',
+                                anchor='w')
+        value_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        return header_label, value_label
+
+    def _build_brokerage(self, parent):
+        status_content = self._section(parent, self.brokerage_title)
+
+        status_row = ttk.Frame(status_content, style='DetailRow.TFrame')
+        status_row.pack(fill=tk.X, pady=2)
+
+        self.status_header = ttk.Label(status_row,
+                                       style='DetailLabel.TLabel',
+                                       width=20,
+                                       anchor='e')
+        self.status_header.pack(side=tk.LEFT, padx=(5, 10))
+
+        # Dropdown for brokerage status
+        self.status_var = tk.StringVar()
+        status_dropdown = ttk.Combobox(status_row,
+                                       textvariable=self.status_var,
+                                       values=['Pending', 'Received'],
+                                       state='readonly',
+                                       width=20)
+        status_dropdown.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.update_button = ttk.Button(status_row,
+                                        text="Update Status",
+                                        style="primary.TButton",
+                                        command=self.update_brokerage_status)
+        self.update_button.pack(side=tk.LEFT)
+
+    def _populate(self):
+        headers = self.app.sheet_cache.headers
+        full_row = self.full_row
+
+        def header(idx):
+            return f"{headers[idx]}:" if idx < len(headers) else ""
+
+        def value(idx):
+            return str((full_row[idx] if idx < len(full_row) else '') or '-')
+
+        self.title_label.configure(text=f"{value(4)}")
+        self.id_label.configure(text=f"ID: {full_row[0]}")
+
+        for idx, (header_label, value_label) in self.field_labels.items():
+            header_label.configure(text=header(idx))
+            value_label.configure(text=value(idx))
+
+        if self.show_brokerage:
+            self.status_header.configure(text=header(22))  # Column W header
+            self.status_var.set(full_row[22] if len(full_row) > 22 and full_row[22] else 'Pending')
+
+        # Same bitset the ColumnStore tags list rows with, blanks included
+        missing_docs = missing_documents(full_row)
+        for idx, (row, header_label, value_label) in self.document_rows.items():
+            header_label.configure(text=header(idx))
+            text = value(idx)
+            value_label.configure(text=text)
+            if missing_docs & (1 << (idx - DOCUMENT_COLUMNS[0])):
+                row.configure(style='Warning.TFrame')
+                value_label.configure(background=self.colors['warning'])
+            else:
+                row.configure(style='DetailRow.TFrame')
+                value_label.configure(background='')
+
+    def update_brokerage_status(self):
+        update_button = self.update_button
+
+        def on_done(error):
+            if update_button.winfo_exists():
+                update_button.configure(state=tk.NORMAL)
+            if error is not None:
+                messagebox.showerror("Error", f"Failed to update brokerage status: {str(error)}")
+                return
+
+            messagebox.showinfo("Success", "Brokerage status updated successfully!")
+            if self.on_status_updated is not None:
+                self.on_status_updated()
+
+        update_button.configure(state=tk.DISABLED)
+        # Queue the write to column W (index 22); it is flushed in a batch
+        self.app.write_queue.update_cell(self.row_index, 23, self.status_var.get(), on_done=on_done)  # 23 because sheets are 1-indexed
+
+    def open_drive_documents(self):
+        full_row = self.full_row
+        drive_link = full_row[29] if len(full_row) > 29 else ''  # Column AD contains the Google Drive folder link
+        if drive_link and self.on_view_documents is not None:
+            self.on_view_documents(full_row)
+        elif drive_link:
+            response = messagebox.askyesno(
+                "Open Documents",
+                "You will be redirected to Google Drive to view the documents. Continue?",
+                icon='question',
+                parent=self.window
+            )
+            if response:
+                webbrowser.open(drive_link)
+        else:
+            messagebox.showwarning("No Documents", "No document folder link available for this asset.",
+                                   parent=self.window)
+
+    def close(self):
+        self._unbind_mousewheel()
+        self.window.withdraw()
+        if self.on_close is not None:
+            self.on_close()
+
+    def _bind_mousewheel(self, event=None):
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self._on_mousewheel)
+
+    def _unbind_mousewheel(self, event=None):
+        self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.unbind_all("<Button-4>")
+        self.canvas.unbind_all("<Button-5>")
+
+    def _on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-1, "units")
+        elif event.num == 5 or event.delta < 0:
+            self.canvas.yview_scroll(1, "units")
+
+    def _center(self, width, height):
+        x = (self.window.winfo_screenwidth() - width) // 2
+        y = (self.window.winfo_screenheight() - height) // 2
+        self.window.geometry(f"{width}x{height}+{x}+{y}")
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+import threading
+
+
+def default_hash_cache_path():
+    return os.path.join(os.path.expanduser("~"), ".assetra", "drive_md5_cache.json")
+
+
+def file_md5(file_path, chunk_size=1024 * 1024):
+    """MD5 of a file, read in fixed-size chunks so large scans are never loaded whole"""
+    digest = hashlib.md5()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, 'rb') as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+class DriveHashCache:
+    """Maps file MD5 hashes to Drive files already holding that content.
+
+    Populated from the ``md5Checksum`` Drive returns for every upload, so a
+    document attached to several units is only uploaded once.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_hash_cache_path()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, md5):
+        with self._lock:
+            return self.entries.get(md5)
+
+    def add(self, md5, file_id):
+        with self._lock:
+            self.entries[md5] = file_id
+            self._save()
+
+    def discard(self, md5):
+        with self._lock:
+            if self.entries.pop(md5, None) is not None:
+                self._save()
@@ -0,0 +1,286 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaFileUpload
+from upload_journal import UploadJournal
+from document_hashes import DriveHashCache, file_md5
+
+
+class UploadError(Exception):
+    """A document upload failed; ``header`` names the document it belongs to"""
+
+    def __init__(self, header, error):
+        super().__init__(f"{header}: {error}")
+        self.header = header
+        self.error = error
+
+
+def _resume_session(request, resumable_uri, offset):
+    """Point a fresh resumable upload ``request`` at an existing session.
+
+    googleapiclient has no public call for this. Marking the request as in
+    error state (a private attribute) makes its next next_chunk() first ask
+    the server how many bytes the session has committed, exactly as it does
+    after a failed chunk, so the journalled ``offset`` is only a starting
+    guess and can never corrupt the upload.
+    """
+    request.resumable_uri = resumable_uri
+    request.resumable_progress = offset
+    request._in_error_state = True
+
+
+class UploadCancelled(Exception):
+    """The upload was abandoned (e.g. its submission timed out) between chunks"""
+
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise UploadCancelled("Upload cancelled")
+
+
+class DriveUploader:
+    """Creates asset folders and uploads documents to Drive.
+
+    googleapiclient services are not thread-safe, so every thread gets its
+    own service built from the shared credentials. Document subfolders are
+    created and files uploaded concurrently on a small pool.
+
+    Files are sent in ``chunk_size`` pieces through a resumable session whose
+    URI and offset are kept in an UploadJournal, so interrupted uploads resume
+    instead of restarting. Files whose MD5 matches something already uploaded
+    are linked with a Drive shortcut instead of being sent again.
+
+    upload_documents() can journal a whole submission: the folders it creates
+    and the files it finishes are recorded under the submission key, so a
+    retry or a later resume carries on in the same folders.
+    """
+
+    # Drive requires chunk sizes in multiples of 256 KB
+    CHUNK_UNIT = 256 * 1024
+
+    def __init__(self, credentials, main_folder_id, max_workers=5, timeout=900,
+                 chunk_size=8 * 1024 * 1024, journal=None, hash_cache=None):
+        self.credentials = credentials
+        self.main_folder_id = main_folder_id
+        self.timeout = timeout
+        self.chunk_size = max(self.CHUNK_UNIT, chunk_size // self.CHUNK_UNIT * self.CHUNK_UNIT)
+        self.journal = journal or UploadJournal()
+        self.hash_cache = hash_cache or DriveHashCache()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="assetra-upload")
+        self._local = threading.local()
+
+    def service(self):
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = self._local.service = build('drive', 'v3',
+                                                  credentials=self.credentials,
+                                                  cache_discovery=False)
+        return service
+
+    def create_folder(self, folder_name, parent_id=None):
+        folder_metadata = {
+            'name': folder_name,
+            'mimeType': 'application/vnd.google-apps.folder',
+            'parents': [parent_id or self.main_folder_id]
+        }
+        folder = self.service().files().create(body=folder_metadata, fields='id').execute()
+        return folder['id']
+
+    def upload_or_link(self, file_path, folder_id, progress=None, cancel=None):
+        """Upload a file unless Drive already has its content.
+
+        Returns (file id, linked) where ``linked`` is True when a shortcut to
+        an existing copy was created instead of an upload. Setting the
+        ``cancel`` event stops the upload before its next chunk.
+        """
+        md5 = file_md5(file_path)
+        existing_id = self.hash_cache.get(md5)
+        if existing_id:
+            _check_cancel(cancel)
+            shortcut_id = self._link_existing(existing_id, md5, file_path, folder_id)
+            if shortcut_id:
+                return shortcut_id, True
+        return self.upload_file(file_path, folder_id, progress, cancel), False
+
+    def _link_existing(self, existing_id, md5, file_path, folder_id):
+        # Make sure the cached copy is still there and still has this content
+        try:
+            existing = self.service().files().get(fileId=existing_id,
+                                                  fields='id,md5Checksum,trashed').execute()
+        except HttpError as e:
+            if e.resp.status == 404:
+                self.hash_cache.discard(md5)
+                return None
+            raise
+        if existing.get('trashed') or existing.get('md5Checksum') != md5:
+            self.hash_cache.discard(md5)
+            return None
+
+        shortcut_metadata = {
+            'name': os.path.basename(file_path),
+            'mimeType': 'application/vnd.google-apps.shortcut',
+            'shortcutDetails': {'targetId': existing_id},
+            'parents': [folder_id]
+        }
+        shortcut = self.service().files().create(body=shortcut_metadata, fields='id').execute()
+        return shortcut.get('id')
+
+    def upload_file(self, file_path, folder_id, progress=None, cancel=None):
+        """Upload a file in chunks; ``progress(fraction)`` is called after each chunk.
+
+        The ``cancel`` event is checked before every chunk; a cancelled upload
+        raises UploadCancelled and keeps its journal entry, so resuming the
+        submission picks it up again.
+        """
+        key = self.journal.key_for(file_path, folder_id)
+        entry = self.journal.get(key)
+        try:
+            return self._upload_chunks(file_path, folder_id, key, entry, progress, cancel)
+        except HttpError as e:
+            # The saved session expired on the server; start a fresh one
+            if entry and e.resp.status in (404, 410):
+                self.journal.remove(key)
+                return self._upload_chunks(file_path, folder_id, key, None, progress, cancel)
+            raise
+
+    def _upload_chunks(self, file_path, folder_id, key, entry, progress, cancel=None):
+        file_metadata = {
+            'name': os.path.basename(file_path),
+            'parents': [folder_id]
+        }
+        media = MediaFileUpload(file_path, chunksize=self.chunk_size, resumable=True)
+        request = self.service().files().create(body=file_metadata, media_body=media, fields='id,md5Checksum')
+
+        if entry and entry.get('resumable_uri'):
+            _resume_session(request, entry['resumable_uri'], entry.get('offset', 0))
+
+        response = None
+        while response is None:
+            _check_cancel(cancel)
+            status, response = request.next_chunk(num_retries=3)
+            if response is None and request.resumable_uri:
+                self.journal.record(key,
+                                    file_path=os.path.abspath(file_path),
+                                    folder_id=folder_id,
+                                    resumable_uri=request.resumable_uri,
+                                    offset=request.resumable_progress)
+            if status is not None and progress is not None:
+                progress(status.progress())
+
+        self.journal.remove(key)
+        # A copy that finished after its submission gave up must not be linked to later
+        _check_cancel(cancel)
+        if response.get('md5Checksum'):
+            self.hash_cache.add(response['md5Checksum'], response['id'])
+        if progress is not None:
+            progress(1.0)
+        return response.get('id')
+
+    def discard_orphan_uploads(self):
+        """Drop upload sessions that no journalled submission is waiting for"""
+        folders = set()
+        for submission in self.journal.pending_submissions().values():
+            folders.update(submission.get('subfolders', {}).values())
+        for key, entry in self.journal.pending().items():
+            if entry.get('folder_id') not in folders:
+                self.journal.remove(key)
+
+    def upload_documents(self, asset_folder_name, documents, progress=None, submission=None):
+        """Upload ``documents`` ({document header: file path}) into a new asset folder.
+
+        The asset folder is created once, then one subfolder per document is
+        created and every file uploaded in parallel. ``progress(header, text)``
+        is called from pool threads as each document moves along. Returns the
+        asset folder id and a {header: file id} dict; raises UploadError for
+        the first document that failed or did not finish within the timeout.
+
+        With a ``submission`` journal key, folders and finished files already
+        recorded for it are reused, and new ones are recorded as they land.
+        """
+        for header, file_path in documents.items():
+            if not os.path.exists(file_path):
+                raise UploadError(header, FileNotFoundError(f"File not found: {file_path}"))
+
+        # One deadline covers folder creation and uploads; once it passes,
+        # running uploads stop at their next chunk
+        deadline = time.monotonic() + self.timeout
+        cancel = threading.Event()
+        journal = self.journal
+        recorded = (journal.get_submission(submission) if submission else None) or {}
+        subfolders = recorded.get('subfolders', {})
+        uploaded = recorded.get('uploaded', {})
+
+        asset_folder_id = recorded.get('asset_folder_id')
+        if not asset_folder_id:
+            asset_folder_id = self.create_folder(asset_folder_name)
+            if submission:
+                journal.record_submission(submission, asset_folder_id=asset_folder_id)
+
+        def create_subfolder(header):
+            if header in subfolders:
+                return subfolders[header]
+            _check_cancel(cancel)
+            try:
+                subfolder_id = self.create_folder(header, asset_folder_id)
+            except Exception as e:
+                raise UploadError(header, e)
+            if submission:
+                journal.record_submission_item(submission, 'subfolders', header, subfolder_id)
+            return subfolder_id
+
+        def upload(header, subfolder_id):
+            if header in uploaded:
+                if progress is not None:
+                    progress(header, "Uploaded")
+                return uploaded[header]
+            if progress is not None:
+                progress(header, "Uploading…")
+            try:
+                file_id, linked = self.upload_or_link(
+                    documents[header],
+                    subfolder_id,
+                    progress=(lambda fraction: progress(header, f"Uploading… {fraction:.0%}"))
+                    if progress is not None else None,
+                    cancel=cancel
+                )
+                if not file_id:
+                    raise Exception("File upload failed")
+            except Exception as e:
+                if progress is not None:
+                    progress(header, "Upload failed")
+                raise UploadError(header, e)
+            if submission:
+                journal.record_submission_item(submission, 'uploaded', header, file_id)
+            if progress is not None:
+                progress(header, "Linked existing copy" if linked else "Uploaded")
+            return file_id
+
+        headers = list(documents)
+        try:
+            subfolder_ids = list(self.pool.map(create_subfolder, headers,
+                                               timeout=max(0, deadline - time.monotonic())))
+        except TimeoutError as e:
+            cancel.set()
+            raise UploadError("Document folders", e)
+        futures = {self.pool.submit(upload, header, subfolder_id): header
+                   for header, subfolder_id in zip(headers, subfolder_ids)}
+
+        done, not_done = wait(futures, timeout=max(0, deadline - time.monotonic()))
+        if not_done:
+            cancel.set()
+        for future in not_done:
+            future.cancel()
+
+        file_ids = {}
+        for future, header in futures.items():
+            if future in not_done:
+                raise UploadError(header, TimeoutError(f"Upload did not finish within {self.timeout} seconds"))
+            file_ids[header] = future.result()
+
+        return asset_folder_id, file_ids
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
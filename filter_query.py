@@ -0,0 +1,140 @@
+import datetime
+import re
+from column_store import FIELDS, ColumnStore
+from sheet_dates import SHEET_DATE_RE
+
+# field, operator and value; values may be "quoted" to include spaces
+TERM_RE = re.compile(r'(?:(\w+)(<=|>=|:|<|>|=))?("[^"]*"|\S+)')
+RELATIVE_RE = re.compile(r'^(-?\d+)([dwmy])$')
+ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+DAYS_PER_UNIT = {'d': 1, 'w': 7, 'm': 30, 'y': 365}
+
+QUERY_FIELDS = set(FIELDS) | {'status'}
+DATE_FIELDS = {'expiry'}
+
+
+class FilterQueryError(ValueError):
+    """The query text could not be compiled"""
+
+
+class Clause:
+    def __init__(self, field, op, value):
+        self.field = field
+        self.op = op
+        self.value = value
+
+
+class FilterQuery:
+    """A compiled filter: field clauses plus free-text search terms.
+
+    Queries look like ``location:Gurgaon status:vacant expiry<90d
+    brokerage:pending manager:"R Sharma"``. ``field:value`` matches a
+    substring (an exact value for indexed fields), ``field=value`` an exact
+    value, and ``<``, ``>``, ``<=``, ``>=`` compare dates or numbers. Dates
+    are mm-dd-yyyy, yyyy-mm-dd or relative to today (``90d``, ``-2w``,
+    ``6m``, ``1y``). Words without a known field, such as ``10:30`` or a
+    pasted link, go to the token search index.
+    """
+
+    def __init__(self, clauses, terms):
+        self.clauses = clauses
+        self.terms = terms
+
+    def run(self, store, search_index=None):
+        """Return the sheet row numbers in ``store`` that satisfy every clause"""
+        candidates = None
+
+        # Narrow with value indexes first, then scan only what is left
+        scans = []
+        for clause in self.clauses:
+            if clause.field in ColumnStore.INDEXED and clause.op in (':', '='):
+                matches = store.indexes[clause.field].get(clause.value, set())
+                candidates = matches if candidates is None else candidates & matches
+            else:
+                scans.append(self._predicate(store, clause))
+
+        if self.terms and search_index is not None:
+            matches = {row_number - 2 for row_number in search_index.search(' '.join(self.terms))}
+            candidates = matches if candidates is None else candidates & matches
+
+        positions = sorted(candidates) if candidates is not None else range(len(store))
+        for predicate in scans:
+            positions = [position for position in positions if predicate(position)]
+        return [store.row_numbers[position] for position in positions]
+
+    def _predicate(self, store, clause):
+        column = store.text[clause.field]
+        if clause.op == ':':
+            return lambda position: clause.value in column[position]
+        if clause.op == '=':
+            return lambda position: column[position] == clause.value
+
+        compare = {
+            '<': lambda a, b: a < b,
+            '>': lambda a, b: a > b,
+            '<=': lambda a, b: a <= b,
+            '>=': lambda a, b: a >= b,
+        }[clause.op]
+
+        if clause.field in DATE_FIELDS:
+            target = _date_target(clause.value)
+            dates = store.expiry
+            return lambda position: dates[position] is not None and compare(dates[position], target)
+
+        try:
+            target = float(clause.value)
+        except ValueError:
+            return lambda position: compare(column[position], clause.value)
+
+        def numeric(position):
+            try:
+                return compare(float(column[position]), target)
+            except ValueError:
+                return False
+        return numeric
+
+
+def _date_target(value):
+    # Only complete dates: half-typed text like "9" must not become a date
+    match = RELATIVE_RE.match(value)
+    if match:
+        days = int(match.group(1)) * DAYS_PER_UNIT[match.group(2)]
+        return datetime.date.today().toordinal() + days
+    match = SHEET_DATE_RE.fullmatch(value)
+    if match:
+        month, day, year = (int(part) for part in match.groups())
+    else:
+        match = ISO_DATE_RE.fullmatch(value)
+        if match is None:
+            raise FilterQueryError(f"Not a date: {value}")
+        year, month, day = (int(part) for part in match.groups())
+    try:
+        return datetime.date(year, month, day).toordinal()
+    except ValueError:
+        raise FilterQueryError(f"Not a date: {value}")
+
+
+def compile_query(text):
+    """Parse query text into a FilterQuery; raises FilterQueryError"""
+    clauses = []
+    terms = []
+    for match in TERM_RE.finditer(text):
+        field, op, value = match.groups()
+        if value.startswith('"') and value.endswith('"') and len(value) > 1:
+            value = value[1:-1]
+        value = value.strip().lower()
+
+        if field and field.lower() not in QUERY_FIELDS:
+            # Not a filter after all ("10:30", "https://..."): search for the text
+            terms.append(match.group(0).lower())
+            continue
+        if not field:
+            terms.append(value)
+            continue
+
+        field = field.lower()
+        if op in ('<', '>', '<=', '>=') and field in DATE_FIELDS:
+            _date_target(value)
+        clauses.append(Clause(field, op, value))
+
+    return FilterQuery(clauses, terms)
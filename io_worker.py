@@ -0,0 +1,77 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job:
+    """Handle for a task submitted to the IOWorker"""
+
+    def __init__(self):
+        self.cancelled = False
+        self.future = None
+
+    def cancel(self):
+        # A cancelled job never delivers its result, even if it already ran
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class IOWorker:
+    """Runs blocking Google API calls off the Tk main thread.
+
+    Tasks execute on a small thread pool and post their outcome to a
+    thread-safe queue. The queue is drained on the Tk thread through
+    master.after, so success and error callbacks are free to touch widgets.
+    """
+
+    def __init__(self, master, max_workers=4, poll_ms=50):
+        self.master = master
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="assetra-io")
+        self.results = queue.Queue()
+        self._closed = False
+        self.master.after(self.poll_ms, self._drain)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, **kwargs):
+        job = Job()
+
+        def run():
+            if job.cancelled:
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self.results.put((job, on_error, e, True))
+            else:
+                self.results.put((job, on_success, result, False))
+
+        job.future = self.executor.submit(run)
+        return job
+
+    def call_soon(self, callback, *args):
+        """Run ``callback(*args)`` on the Tk thread; safe to call from any thread"""
+        self.results.put((None, lambda value: callback(*args), None, False))
+
+    def _drain(self):
+        while True:
+            try:
+                job, callback, value, failed = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if job is not None and job.cancelled:
+                continue
+            if callback is not None:
+                try:
+                    callback(value)
+                except Exception as e:
+                    print(f"Error in background task callback: {str(e)}")
+            elif failed:
+                print(f"Background task failed: {str(value)}")
+
+        if not self._closed:
+            self.master.after(self.poll_ms, self._drain)
+
+    def shutdown(self):
+        self._closed = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
+import re
 import platform
 from ttkbootstrap import Style, DateEntry
 from datetime import datetime
+from drive_uploads import UploadError
+
+
+class SubmissionError(Exception):
+    """Raised by the background submission with the title for its error dialog"""
+
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
 
 
 class MainUI:
@@ -12,7 +22,9 @@ class MainUI:
         self.app = app
         self.entries = {}
         self.document_entries = {}
+        self.document_status_labels = {}
         self.doc_frame_created = False
+        self._failed_submission = None  # journal key of the last submission that failed
         self.os_type = platform.system()
         self.date_fields = [
             "Date ",
@@ -428,6 +440,7 @@ class MainUI:
                 upload_button.pack(side=tk.RIGHT)
 
                 self.document_entries[header] = None
+                self.document_status_labels[header] = status_label
 
             # Add submit button at the bottom of document upload section
             submit_frame = ttk.Frame(self.scrollable_frame, style='Content.TFrame')
@@ -545,96 +558,217 @@ class MainUI:
             asset_folder_name = f"{folder_components[0]}-{folder_components[1]}{folder_components[2]} {folder_components[3]}"
             asset_folder_name = asset_folder_name.strip()
 
-            # Process document uploads (Columns X through AB)
-            doc_headers = [
-                "KYC",  # Column X
-                "Tenent Verification",  # Column Y
-                "Property tax",  # Column Z
-                "Lease upload",  # Column AA
-                "Cheque PDC"  # Column AB
-            ]
-
-            has_uploads = False
-            asset_folder_id = None
-
-            # Handle document uploads
-            for doc_header in doc_headers:
-                file_path = self.document_entries.get(doc_header)
-
-                if file_path == "NA":
-                    row.append("NA")
-                elif file_path:
-                    try:
-                        if not has_uploads:
-                            asset_folder_id = self.app.create_subfolder(asset_folder_name)
-                            has_uploads = True
-
-                        subfolder_id = self.app.create_subfolder(doc_header, asset_folder_id)
-
-                        if not os.path.exists(file_path):
-                            raise FileNotFoundError(f"File not found: {file_path}")
-
-                        upload_success = self.app.upload_file_to_folder(file_path, subfolder_id)
-
-                        if upload_success:
-                            row.append("UPLOADED")
-                        else:
-                            raise Exception("File upload failed")
-
-                    except Exception as e:
-                        print(f"Error processing document {doc_header}: {str(e)}")
-                        messagebox.showerror(
-                            "Document Processing Error",
-                            f"Failed to process {doc_header}: {str(e)}"
-                        )
-                        return False
-                else:
-                    row.append("")
-
-            # Add Lease Manager (Column AC)
+            # Uploads and the sheet write run on the I/O worker so the window stays responsive
             lease_manager_value = data.get("Lease Manager", "")
-            row.append(lease_manager_value)
+            self._set_submitting(True)
+            self.app.io.submit(self._upload_and_insert,
+                               row,
+                               asset_folder_name,
+                               dict(self.document_entries),
+                               lease_manager_value,
+                               on_success=self._on_submit_success,
+                               on_error=self._on_submit_error)
+            return True
+
+        except Exception as e:
+            messagebox.showerror(
+                "Submission Error",
+                f"An unexpected error occurred while submitting the data:\n{str(e)}"
+            )
+            return False
 
-            # Add folder link (Column AD)
-            folder_link = f"https://drive.google.com/drive/folders/{asset_folder_id}" if has_uploads else ""
-            row.append(folder_link)
+    def _upload_and_insert(self, row, asset_folder_name, document_entries, lease_manager_value):
+        # Runs on the I/O worker: no widget access in here
+        # Process document uploads (Columns X through AB)
+        doc_headers = [
+            "KYC",  # Column X
+            "Tenent Verification",  # Column Y
+            "Property tax",  # Column Z
+            "Lease upload",  # Column AA
+            "Cheque PDC"  # Column AB
+        ]
 
-            # Debug print to verify data
-            print("Row data before submission:")
-            for idx, value in enumerate(row):
-                print(f"Column {idx}: {value}")
+        for doc_header in doc_headers:
+            file_path = document_entries.get(doc_header)
 
+            if file_path == "NA":
+                row.append("NA")
+            elif file_path:
+                row.append("UPLOADED")
+            else:
+                row.append("")
+
+        # Add Lease Manager (Column AC)
+        row.append(lease_manager_value)
+
+        uploads = {doc_header: document_entries[doc_header] for doc_header in doc_headers
+                   if document_entries.get(doc_header) not in (None, "", "NA")}
+        journal = self.app.drive_uploader.journal
+        submission = journal.submission_key(asset_folder_name, uploads) if uploads else None
+
+        # A different submission after a failed one means the user gave up on it
+        if self._failed_submission and self._failed_submission != submission:
+            journal.remove_submission(self._failed_submission)
+        self._failed_submission = None
+
+        # A blank Asset ID is handed out here, off the Tk thread, since it may
+        # need the snapshot loaded; a retried submission keeps the ID it was given
+        if row[0] in (None, ''):
+            recorded = journal.get_submission(submission) if submission else None
+            if recorded and recorded.get('row') and recorded['row'][0]:
+                row[0] = recorded['row'][0]
+            else:
+                row[0] = str(self.app.sheet_cache.allocate_asset_id())
+
+        if submission:
+            # Journal the whole submission first so a retry or the next launch can finish it
+            journal.record_submission(submission,
+                                      asset_folder_name=asset_folder_name,
+                                      documents=uploads,
+                                      row=row)
+        try:
+            self._finish_submission(
+                submission, row, asset_folder_name, uploads,
+                progress=lambda header, text: self.app.io.call_soon(self._show_upload_progress, header, text)
+            )
+        except SubmissionError:
+            self._failed_submission = submission
+            raise
+
+    def _finish_submission(self, submission, row, asset_folder_name, uploads, progress=None, resuming=False):
+        # Upload the documents (reusing whatever the journal already holds), then append the row
+        asset_folder_id = None
+        if uploads:
             try:
-                # Use insert_row instead of append_row for better control
-                next_row = len(self.app.sheet.get_all_values()) + 1
-                self.app.sheet.insert_row(row, next_row, value_input_option='USER_ENTERED')
-
-                messagebox.showinfo(
-                    "Success",
-                    "Asset information and documents have been successfully submitted."
+                asset_folder_id, _ = self.app.drive_uploader.upload_documents(
+                    asset_folder_name,
+                    uploads,
+                    progress=progress,
+                    submission=submission
                 )
-                self.clear_input_fields()
+            except UploadError as e:
+                print(f"Error processing document {e.header}: {str(e.error)}")
+                raise SubmissionError("Document Processing Error",
+                                      f"Failed to process {e.header}: {str(e.error)}")
+
+        # Add folder link (Column AD)
+        folder_link = f"https://drive.google.com/drive/folders/{asset_folder_id}" if uploads else ""
+        row = row + [folder_link]
+
+        # Debug print to verify data
+        print("Row data before submission:")
+        for idx, value in enumerate(row):
+            print(f"Column {idx}: {value}")
+
+        # An earlier session may have appended the row and stopped before clearing the journal
+        if resuming and any(len(existing) > 29 and existing[29] == folder_link
+                            for _, existing in self.app.sheet_cache.lookup_all(str(row[0]))):
+            self.app.drive_uploader.journal.remove_submission(submission)
+            return
 
-                if self.doc_frame_created:
-                    self.doc_frame.destroy()
-                    self.doc_frame_created = False
-                    self.submit_button.pack_forget()
+        try:
+            # Server-side append: no need to download the sheet to find the next row
+            response = self.app.sheet.append_row(row,
+                                                 value_input_option='USER_ENTERED',
+                                                 insert_data_option='INSERT_ROWS',
+                                                 table_range='A1')
+        except Exception as e:
+            raise SubmissionError("Sheet Update Error", f"Failed to update spreadsheet: {str(e)}")
+
+        if submission:
+            self.app.drive_uploader.journal.remove_submission(submission)
+
+        # Record the new row locally; a row number that does not line up with
+        # our snapshot means someone else changed the sheet, and an Asset ID
+        # we already hold means another client took it from a stale snapshot.
+        # Either way the snapshot is refetched.
+        updated_range = response.get('updates', {}).get('updatedRange', '')
+        match = re.search(r'![A-Z]+(\d+)', updated_range)
+        cache = self.app.sheet_cache
+        if match is None or cache.lookup_all(str(row[0])) \
+                or not cache.append_local(int(match.group(1)), self._display_row(row)):
+            cache.invalidate()
+
+    def resume_submissions(self):
+        """Finish submissions an earlier session was cut off in; runs on the I/O worker.
+
+        Returns the asset folder names that were completed. Submissions that
+        fail again stay journalled for the next launch, unless one of their
+        files is gone, in which case they can never finish and are dropped.
+        """
+        journal = self.app.drive_uploader.journal
+        finished = []
+        pending = journal.pending_submissions()
+        if pending:
+            # The snapshot may have been seeded from the mirror, which never saw
+            # a row appended just before a crash; read the sheet itself so that
+            # row is found rather than appended twice
+            self.app.sheet_cache.get_all_values(force=True)
+        for submission, entry in pending.items():
+            documents = entry.get('documents', {})
+            if 'row' not in entry or not all(os.path.exists(path) for path in documents.values()):
+                print(f"Dropping submission {entry.get('asset_folder_name')}: its documents are gone")
+                journal.remove_submission(submission)
+                continue
+            try:
+                self._finish_submission(submission, entry['row'], entry['asset_folder_name'],
+                                        documents, resuming=True)
+                finished.append(entry['asset_folder_name'])
+            except SubmissionError as e:
+                print(f"Failed to resume submission {entry['asset_folder_name']}: {str(e)}")
+        self.app.drive_uploader.discard_orphan_uploads()
+        return finished
+
+    def _display_row(self, row):
+        # Show dates as the sheet renders them rather than as =DATE() formulas
+        display = []
+        for value in row:
+            match = re.fullmatch(r'=DATE\((\d+),(\d+),(\d+)\)', str(value))
+            if match:
+                year, month, day = (int(part) for part in match.groups())
+                value = f"{month:02d}-{day:02d}-{year}"
+            display.append(str(value))
+        return display
+
+    def _show_upload_progress(self, header, text):
+        status_label = self.document_status_labels.get(header)
+        if status_label is not None and status_label.winfo_exists():
+            file_path = self.document_entries.get(header)
+            name = os.path.basename(file_path) if file_path else ""
+            status_label.configure(text=f"{name} — {text}" if name else text)
+
+    def _set_submitting(self, submitting):
+        state = tk.DISABLED if submitting else tk.NORMAL
+        self.submit_button.configure(state=state,
+                                     text="Submitting…" if submitting else "Submit Asset")
+        self.upload_docs_button.configure(state=state)
+
+    def _on_submit_success(self, result):
+        self._set_submitting(False)
+        messagebox.showinfo(
+            "Success",
+            "Asset information and documents have been successfully submitted."
+        )
+        self.clear_input_fields()
 
-                return True
+        if self.doc_frame_created:
+            self.doc_frame.destroy()
+            self.doc_frame_created = False
+            self.submit_button.pack_forget()
 
-            except Exception as e:
-                messagebox.showerror(
-                    "Sheet Update Error",
-                    f"Failed to update spreadsheet: {str(e)}"
-                )
-                return False
+        # The new row is already in the local snapshot, so this costs no fetch
+        self.app.asset_list.update_asset_list()
 
-        except Exception as e:
+    def _on_submit_error(self, error):
+        self._set_submitting(False)
+        if isinstance(error, SubmissionError):
+            messagebox.showerror(error.title, str(error))
+        else:
             messagebox.showerror(
                 "Submission Error",
-                f"An unexpected error occurred while submitting the data:\n{str(e)}"
+                f"An unexpected error occurred while submitting the data:\n{str(error)}"
             )
-            return False
+
     def clear_input_fields(self):
         # Clear all entry fields
         for header, entry in self.entries.items():
@@ -0,0 +1,100 @@
+import re
+import threading
+from collections import OrderedDict
+
+FOLDER_ID_RE = re.compile(r'/folders/([\w-]+)')
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+
+def folder_id_from_link(link):
+    """Extract the folder id from a Drive folder link (column AD)"""
+    match = FOLDER_ID_RE.search(link or '')
+    return match.group(1) if match else None
+
+
+class DriveFolderCache:
+    """Bounded LRU of asset document listings from Drive.
+
+    A listing covers the asset folder and the per-document subfolders
+    MainUI creates inside it. Listings are warmed speculatively with
+    prefetch() while the user moves through rows; only the latest prefetch
+    is kept alive, so moving on cancels the one before it.
+    """
+
+    def __init__(self, io, uploader, max_entries=64):
+        self.io = io
+        self.uploader = uploader
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._prefetch_job = None
+
+    def get(self, folder_id):
+        with self._lock:
+            listing = self.entries.get(folder_id)
+            if listing is not None:
+                self.entries.move_to_end(folder_id)
+            return listing
+
+    def _put(self, folder_id, listing):
+        with self._lock:
+            self.entries[folder_id] = listing
+            self.entries.move_to_end(folder_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _children(self, parent_ids):
+        query = " or ".join(f"'{parent_id}' in parents" for parent_id in parent_ids)
+        files = []
+        page_token = None
+        while True:
+            response = self.uploader.service().files().list(
+                q=f"({query}) and trashed = false",
+                fields='nextPageToken, files(id, name, mimeType, parents, webViewLink)',
+                orderBy='name',
+                pageToken=page_token
+            ).execute()
+            files.extend(response.get('files', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return files
+
+    def list_folder(self, folder_id):
+        """Return [{name, document, link}] for an asset folder; blocking, run on a worker"""
+        listing = self.get(folder_id)
+        if listing is not None:
+            return listing
+
+        children = self._children([folder_id])
+        subfolders = {f['id']: f['name'] for f in children if f['mimeType'] == FOLDER_MIME_TYPE}
+        files = [f for f in children if f['mimeType'] != FOLDER_MIME_TYPE]
+        if subfolders:
+            files += self._children(list(subfolders))
+
+        listing = [{
+            'name': f['name'],
+            'document': next((subfolders[p] for p in f.get('parents', []) if p in subfolders), ''),
+            'link': f.get('webViewLink', ''),
+        } for f in files]
+        self._put(folder_id, listing)
+        return listing
+
+    def prefetch(self, folder_id):
+        """Warm ``folder_id`` in the background, abandoning any earlier prefetch"""
+        if self._prefetch_job is not None:
+            self._prefetch_job.cancel()
+            self._prefetch_job = None
+        if not folder_id or self.get(folder_id) is not None:
+            return
+        # A failed prefetch is not worth reporting; fetch() will retry on demand
+        self._prefetch_job = self.io.submit(self.list_folder, folder_id,
+                                            on_error=lambda e: None)
+
+    def fetch(self, folder_id, on_success, on_error):
+        """Deliver the listing to ``on_success`` on the Tk thread, from cache when possible"""
+        listing = self.get(folder_id)
+        if listing is not None:
+            on_success(listing)
+            return None
+        return self.io.submit(self.list_folder, folder_id,
+                              on_success=on_success, on_error=on_error)
@@ -0,0 +1,254 @@
+import argparse
+import csv
+import datetime
+import json
+import sys
+from bisect import bisect_left
+from column_store import ColumnStore
+from sheet_mirror import SheetMirror, default_mirror_path
+
+WINDOWS = ("30", "60", "90", "120", "180", "All", "Expired")
+
+# What to remind about: lease expiry alone, every date column, or one date type
+LEASE_EXPIRY = "Lease Expiry"
+ALL_DATES = "All Dates"
+DATE_CHOICES = (LEASE_EXPIRY, ALL_DATES, "Lock-in Expiry", "Commencement", "Date")
+
+# Days left at or under which a lease is urgent / a warning
+URGENT_DAYS = 15
+WARNING_DAYS = 31
+STATUSES = ('urgent', 'warning', 'normal')
+
+FIELDNAMES = ("Lease Manager", "Asset ID", "Micro Market", "Location", "Project", "Tower",
+              "Floor", "Unit Number", "Event", "Date", "Days Remaining", "Status")
+
+
+class Reminder:
+    """One dated event for one sheet row"""
+
+    def __init__(self, store, ordinal, position, column, event, status, today):
+        row = store.rows[position]
+        # The API trims trailing blank cells, so pad short rows
+        row = row + [''] * (max(29, column + 1) - len(row))
+        self.row_number = store.row_numbers[position]
+        self.position = position
+        self.row = row
+        self.column = column
+        self.event = event
+        self.ordinal = ordinal
+        self.days_left = ordinal - today
+        self.status = status
+
+    @property
+    def manager(self):
+        return self.row[28].strip() or "Unassigned"
+
+    def fields(self):
+        row = self.row
+        return {
+            "Lease Manager": self.manager,
+            "Asset ID": f"AST-{row[0]}",
+            "Micro Market": row[2],
+            "Location": row[3],
+            "Project": row[4],
+            "Tower": row[10],
+            "Floor": row[11],
+            "Unit Number": row[12],
+            "Event": self.event,
+            "Date": row[self.column],
+            "Days Remaining": self.days_left,
+            "Status": self.status,
+        }
+
+
+class ReminderEngine:
+    """Time-window queries and status buckets over one snapshot"""
+
+    def __init__(self, store, today=None):
+        self.store = store
+        self.today = today if today is not None else datetime.date.today().toordinal()
+        # Last urgent and last warning ordinals; a date's bucket is a bisect
+        self.status_bounds = (self.today + URGENT_DAYS, self.today + WARNING_DAYS)
+
+    def bounds(self, days_filter):
+        """(first, last) ordinals of a window: first < date <= last"""
+        if days_filter.lower() == 'expired':
+            return float('-inf'), self.today
+        if days_filter.lower() == 'all':
+            return self.today, float('inf')
+        return self.today, self.today + int(days_filter)
+
+    def events(self, days_filter="30", dates=LEASE_EXPIRY):
+        """(ordinal, position, column) for every event in the window, soonest first"""
+        store = self.store
+        first, last = self.bounds(days_filter)
+        if dates == LEASE_EXPIRY:
+            # A window is a slice of the sorted expiry index
+            index = store.expiry_index()
+            start, end = index.between(first, last)
+            return [(index.ordinals[i], index.positions[i], 14) for i in range(start, end)]
+
+        timeline = store.timeline()
+        if dates == ALL_DATES:
+            return timeline.between(first, last)
+        return timeline.between(first, last, [idx for idx, label in timeline.labels.items()
+                                              if label == dates])
+
+    def labels(self, dates=LEASE_EXPIRY):
+        """Column index -> event name for the rows events() returns"""
+        if dates == LEASE_EXPIRY:
+            return {14: LEASE_EXPIRY}
+        return self.store.timeline().labels
+
+    def status(self, ordinal, expired_view=False):
+        """'expired', 'urgent', 'warning' or 'normal' for an event date"""
+        if expired_view:
+            return 'expired'
+        return STATUSES[bisect_left(self.status_bounds, ordinal)]
+
+    def reminders(self, days_filter="30", dates=LEASE_EXPIRY, events=None):
+        """Yield a Reminder for each event, in the order of ``events`` (soonest first by default)"""
+        if events is None:
+            events = self.events(days_filter, dates)
+        labels = self.labels(dates)
+        expired_view = days_filter.lower() == 'expired'
+        for ordinal, position, column in events:
+            yield Reminder(self.store, ordinal, position, column, labels[column],
+                           self.status(ordinal, expired_view), self.today)
+
+    def digest(self, days_filter="30", dates=LEASE_EXPIRY, manager=None):
+        """Return [(lease manager, [Reminder])], managers sorted by name"""
+        groups = {}
+        for reminder in self.reminders(days_filter, dates):
+            groups.setdefault(reminder.manager, []).append(reminder)
+        if manager is not None:
+            wanted = manager.strip().lower()
+            groups = {name: items for name, items in groups.items() if name.lower() == wanted}
+        return sorted(groups.items(), key=lambda item: item[0].lower())
+
+
+def write_csv(digest, out):
+    writer = csv.DictWriter(out, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    for _, reminders in digest:
+        for reminder in reminders:
+            writer.writerow(reminder.fields())
+
+
+def write_json(digest, out, window, dates, today):
+    # Written one manager at a time rather than built as one document
+    generated = datetime.date.fromordinal(today).isoformat()
+    out.write(f'{{"generated": {json.dumps(generated)}, "window": {json.dumps(window)}, '
+              f'"dates": {json.dumps(dates)}, "managers": [')
+    for i, (manager, reminders) in enumerate(digest):
+        if i:
+            out.write(', ')
+        json.dump({"manager": manager,
+                   "reminders": [reminder.fields() for reminder in reminders]}, out, ensure_ascii=False)
+    out.write(']}\n')
+
+
+def write_text(digest, out, window, dates):
+    scope = "expired" if window.lower() == 'expired' else (
+        "upcoming" if window.lower() == 'all' else f"within {window} days")
+    out.write(f"{dates} reminders ({scope})\n")
+    if not digest:
+        out.write("\nNothing due.\n")
+    for manager, reminders in digest:
+        out.write(f"\n{manager} ({len(reminders)})\n")
+        for reminder in reminders:
+            fields = reminder.fields()
+            days = abs(reminder.days_left)
+            plural = 's' if days != 1 else ''
+            if reminder.days_left > 0:
+                when = f"in {days:,} day{plural}"
+            else:
+                when = f"{days:,} day{plural} ago" if days else "today"
+            out.write(f"  {fields['Asset ID']:<10} {fields['Micro Market']:<30} "
+                      f"{reminder.event}: {fields['Date']} ({when}) [{reminder.status}]\n")
+
+
+def load_snapshot(path):
+    """Read a sheet snapshot saved as JSON (get_all_values() shape) or CSV"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.json'):
+            return json.load(f)
+        return [row for row in csv.reader(f)]
+
+
+def fetch_live(credentials, spreadsheet_id, mirror):
+    """Read the sheet once and sync it into the mirror"""
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    scope = ['https://spreadsheets.google.com/feeds',
+             'https://www.googleapis.com/auth/drive']
+    creds = ServiceAccountCredentials.from_json_keyfile_name(credentials, scope)
+    values = gspread.authorize(creds).open_by_key(spreadsheet_id).sheet1.get_all_values()
+    mirror.sync(values)
+    return values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Print lease reminders per lease manager, without the GUI. Reads the local "
+                    "sheet mirror by default, so a report makes no API calls.",
+        epilog='e.g. reminder_engine.py --days 60 --format csv -o expiring.csv')
+    parser.add_argument('--days', default="30", choices=[w.lower() for w in WINDOWS],
+                        type=str.lower, help="time window (default: 30)")
+    parser.add_argument('--dates', default=LEASE_EXPIRY, choices=DATE_CHOICES,
+                        help="date type to report (default: Lease Expiry)")
+    parser.add_argument('--format', default='text', choices=('text', 'csv', 'json'))
+    parser.add_argument('--manager', help="only this lease manager")
+    parser.add_argument('--output', '-o', help="write here instead of stdout")
+    parser.add_argument('--today', type=datetime.date.fromisoformat,
+                        help="report as of this date (YYYY-MM-DD)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--mirror', help=f"SQLite mirror (default: {default_mirror_path()})")
+    source.add_argument('--snapshot', help="sheet snapshot file (.json or .csv)")
+    parser.add_argument('--refresh', action='store_true',
+                        help="fetch the sheet once and update the mirror first")
+    parser.add_argument('--credentials', help="service account key file, for --refresh")
+    parser.add_argument('--spreadsheet', help="spreadsheet key, for --refresh")
+    args = parser.parse_args(argv)
+
+    if args.refresh and (args.snapshot or not args.credentials or not args.spreadsheet):
+        parser.error("--refresh needs --credentials and --spreadsheet and cannot use --snapshot")
+
+    if args.snapshot:
+        values = load_snapshot(args.snapshot)
+    else:
+        mirror = SheetMirror(args.mirror)
+        try:
+            values = fetch_live(args.credentials, args.spreadsheet, mirror) if args.refresh else mirror.load()
+        finally:
+            mirror.close()
+        if not values:
+            parser.error("the mirror is empty; open the app once or use --refresh")
+
+    today = (args.today or datetime.date.today()).toordinal()
+    engine = ReminderEngine(ColumnStore(values, 0), today=today)
+    window = next(w for w in WINDOWS if w.lower() == args.days)
+    digest = engine.digest(window, args.dates, manager=args.manager)
+
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            write_csv(digest, out)
+        elif args.format == 'json':
+            write_json(digest, out, window, args.dates, today)
+        else:
+            write_text(digest, out, window, args.dates)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    failures = engine.store.expiry_failures
+    if failures:
+        print(f"warning: {len(failures)} row(s) have an unreadable lease expiry and were skipped",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import datetime
+
+# Longest single after() wait; waking early only re-arms, it never refetches
+MAX_DELAY_MS = 6 * 60 * 60 * 1000
+
+
+class ReminderScheduler:
+    """Calls ``on_new_day`` just after each local midnight.
+
+    Days left are whole days, so every change Reminders can show on its own
+    (a lease crossing 31 or 15 days, expiring, entering a window, and the
+    countdown itself) happens at a day boundary. One after() timer waits for
+    the next one instead of an hourly poll. The Reminders tab refreshes the
+    sheet from the callback and follows snapshot changes between ticks.
+    """
+
+    def __init__(self, widget, on_new_day):
+        self.widget = widget
+        self.on_new_day = on_new_day
+        self._day = None
+        self._after_id = None
+
+    def start(self):
+        self._day = datetime.date.today().toordinal()
+        self._arm()
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _arm(self):
+        self.cancel()
+        midnight = datetime.datetime.combine(datetime.date.fromordinal(self._day + 1), datetime.time())
+        delay = (midnight - datetime.datetime.now()).total_seconds() * 1000
+        delay = int(min(max(delay, 0), MAX_DELAY_MS)) + 1000
+        self._after_id = self.widget.after(delay, self._fire)
+
+    def _fire(self):
+        self._after_id = None
+        today = datetime.date.today().toordinal()
+        if today == self._day:
+            # Woke early (long wait split up, or the clock moved); keep waiting
+            self._arm()
+            return
+
+        self._day = today
+        self._arm()
+        self.on_new_day()
@@ -1,9 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import datetime
-from dateutil.parser import parse
 from ttkbootstrap import Style
-import webbrowser
+from detail_view import AssetDetailView
+from column_store import DATE_HEADERS
+from reminder_engine import ReminderEngine, WINDOWS, LEASE_EXPIRY, DATE_CHOICES
+from reminder_schedule import ReminderScheduler
+from sheet_cache import column_letter
+from tree_views import ColumnSorter, TreeLoader
 
 
 
@@ -42,13 +45,19 @@ class AssetManagementApp:
 
 
 class Reminders:
+    # Columns behind the reminder rows; the date columns are added from the headers
+    COLUMNS = ("A", "C:E", "K:M", "O", "AC")
+
+
     def __init__(self, parent, app):
         self.status_colors = None
         self.colors = None
         self.parent = parent
         self.app = app
+        self._store = None
         self.style = Style(theme='flatly')
         self.selected_days = tk.StringVar(value="30")
+        self.selected_dates = tk.StringVar(value=LEASE_EXPIRY)
         self.setup_styles()
         self.create_reminders_ui()
 
@@ -170,12 +179,25 @@ class Reminders:
         filter_frame = ttk.Frame(header_frame, style='Filter.TFrame')
         filter_frame.pack(side=tk.RIGHT, pady=(10, 0))
 
+        ttk.Label(filter_frame,
+                  text="Show:",
+                  style='Filter.TLabel').pack(side=tk.LEFT, padx=(0, 10))
+
+        dates_dropdown = ttk.Combobox(filter_frame,
+                                      textvariable=self.selected_dates,
+                                      values=DATE_CHOICES,
+                                      width=14,
+                                      font=('Segoe UI', 10),
+                                      state="readonly")
+        dates_dropdown.pack(side=tk.LEFT, padx=(0, 15))
+        dates_dropdown.bind('<<ComboboxSelected>>', lambda e: self._on_dates_changed())
+
         filter_label = ttk.Label(filter_frame,
                                  text="Time Range:",
                                  style='Filter.TLabel')
         filter_label.pack(side=tk.LEFT, padx=(0, 10))
 
-        days_options = ["30", "60", "90", "120", "180", "All", "Expired"]
+        days_options = list(WINDOWS)
         days_dropdown = ttk.Combobox(filter_frame,
                                      textvariable=self.selected_days,
                                      values=days_options,
@@ -215,15 +237,13 @@ class Reminders:
                                   background=self.colors['surface'])
                 label.pack(side=tk.LEFT)
 
-        # Bind the dropdown selection to update both the reminders and status indicators
-        days_dropdown.bind('<<ComboboxSelected>>', lambda e: (self.refresh_reminders(), update_status_indicators()))
+        # Switching windows re-slices the loaded snapshot; only Refresh goes to the sheet
+        days_dropdown.bind('<<ComboboxSelected>>', lambda e: (self._render_view(), update_status_indicators()))
 
         ttk.Label(filter_frame,
                   text="days",
                   style='Filter.TLabel').pack(side=tk.LEFT)
 
-        days_dropdown.bind('<<ComboboxSelected>>', lambda e: self.refresh_reminders())
-
         # Status indicators
         legend_frame = ttk.Frame(container, style='Filter.TFrame')
         legend_frame.pack(fill=tk.X, padx=20, pady=10)
@@ -257,7 +277,7 @@ class Reminders:
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(10, 20))
 
         columns = ['Asset ID','Lease Manager','Micro Market', 'Location', 'Project', 'Tower', 'Floor', 'Unit Number',
-                   'Lease Expiry', 'Days Remaining' ]
+                   'Lease Expiry', 'Days Remaining', 'Event']
         self.tree = ttk.Treeview(tree_frame,
                                  columns=columns,
                                  show="headings",
@@ -267,6 +287,15 @@ class Reminders:
         self.tree.bind('<Double-1>', self.on_treeview_double_click)
         self.tree.bind('<Motion>', self.on_hover)
 
+        # Shared by every reminder row opened with a double-click
+        self.detail_view = AssetDetailView(self.parent, self.app, self.colors,
+                                           groups={
+                                               'Basic Info': [0, 1, 2, 3, 4, 5],
+                                               'Property Details': [6, 7, 8, 9, 10],
+                                               'Lease Information': [11, 12, 13, 14, 15],
+                                               'Additional Details': [16, 17, 18, 19, 20]
+                                           })
+
 
         col_widths = {
             'Asset ID': 60,
@@ -278,7 +307,8 @@ class Reminders:
             'Floor': 80,
             'Unit Number': 80,
             'Lease Expiry': 80,
-            'Days Remaining': 70
+            'Days Remaining': 70,
+            'Event': 90
 
         }
 
@@ -286,12 +316,27 @@ class Reminders:
             self.tree.heading(col, text=col, anchor=tk.W)
             self.tree.column(col, width=col_widths[col], minwidth=col_widths[col])
 
+        # Click a heading to sort; both date columns sort by the expiry date
+        self.sorter = ColumnSorter(self.tree,
+                                   dict(zip(columns, [0, 28, 2, 3, 4, 10, 11, 12, 14, 14, 14])),
+                                   self._render_view)
+        # The Event column only appears in the timeline views
+        self.tree.configure(displaycolumns=columns[:-1])
+        self.tree_columns = columns
+
         # Scrollbar
         # Scrollbar with proper binding
         scrollbar = ttk.Scrollbar(tree_frame,
                                 orient="vertical",
                                 command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
+        # Once a day, just after midnight, re-read the sheet (if the snapshot
+        # is older than the cache TTL) and re-slice the windows for the new day
+        self.scheduler = ReminderScheduler(self.tree, self.refresh_reminders)
+        self.scheduler.start()
+        # Any tab's fetch or write produces a new snapshot; pick it up without refetching
+        self.app.sheet_cache.add_listener(
+            lambda version: self.app.io.call_soon(self._on_snapshot_changed, version))
 
         self.tree.bind('<MouseWheel>', self._on_mousewheel)       # Windows
         self.tree.bind('<Button-4>', self._on_mousewheel)         # Linux up
@@ -307,264 +352,146 @@ class Reminders:
         refresh_button = ttk.Button(filter_frame,
                                     text="Refresh",
                                     style='Action.TButton',
-                                    command=self.refresh_reminders)
+                                    command=lambda: self.refresh_reminders(force=True))
         refresh_button.pack(side=tk.LEFT, padx=(10, 0))
 
+        self.loading_label = ttk.Label(filter_frame,
+                                       text="",
+                                       style='Filter.TLabel')
+        self.loading_label.pack(side=tk.LEFT, padx=(10, 0))
+        self.loader = TreeLoader(self.tree, scrollbar, self.app.io, self.loading_label, "reminders")
+
+        # Lease expiry cells that are not dates; click for the list
+        self.unreadable_label = ttk.Label(filter_frame,
+                                          text="",
+                                          style='Filter.TLabel',
+                                          foreground=self.status_colors['expired'],
+                                          cursor="hand2")
+        self.unreadable_label.pack(side=tk.LEFT, padx=(10, 0))
+        self.unreadable_label.bind('<Button-1>', lambda e: self.show_unreadable_dates())
+
         # Initialize data
         self.refresh_reminders()
 
-    def refresh_reminders(self):
-        self.tree.delete(*self.tree.get_children())
-        all_rows = self.app.sheet.get_all_values()
-        today = datetime.date.today()
+    def refresh_reminders(self, force=False):
+        def load():
+            self.app.sheet_cache.refresh(force=force, columns=self.COLUMNS + self._date_columns())
+            return self._build_store()
 
+        self.loader.load(load, self._on_reminders_loaded)
+
+    def _build_store(self):
+        # Runs on the I/O worker so the indexes are sorted off the Tk thread
+        store = self.app.sheet_cache.column_store()
+        store.expiry_index()
+        store.timeline()
+        return store
+
+    def _on_snapshot_changed(self, version):
+        # A load in flight re-checks the version when it lands
+        if self.loader.loading or (self._store is not None and self._store.version >= version):
+            return
+        self.loader.load(self._build_store, self._on_reminders_loaded)
+
+    def _date_columns(self):
+        """Letters of the date columns named in the sheet's header row"""
+        return tuple(column_letter(idx) for idx, header in enumerate(self.app.headers)
+                     if header in DATE_HEADERS)
+
+    def _on_dates_changed(self):
+        timeline = self.selected_dates.get() != LEASE_EXPIRY
+        self.sorter.relabel('Lease Expiry', "Date" if timeline else 'Lease Expiry')
+        self.tree.configure(displaycolumns=self.tree_columns if timeline else self.tree_columns[:-1])
+        self._render_view()
+
+    def _on_reminders_loaded(self, store):
+        self._store = store
+        self._render_view()
+        # Another snapshot may have landed while this one was being built
+        self._on_snapshot_changed(self.app.sheet_cache.version)
+
+    def _render_view(self):
+        store = self._store
+        if store is None:
+            return
+        engine = ReminderEngine(store)
         days_filter = self.selected_days.get()
-        show_expired = days_filter.lower() == 'expired'
+        dates = self.selected_dates.get()
+
+        self.tree.tag_configure('expired', background=self.status_colors['expired'])
+        self.tree.tag_configure('urgent', background=self.status_colors['urgent'])
+        self.tree.tag_configure('warning', background=self.status_colors['warning'])
+        self.tree.tag_configure('normal', background=self.status_colors['normal'])
+
+        failures = len(store.expiry_failures)
+        self.unreadable_label.configure(
+            text=f"⚠ {failures:,} unreadable lease expiry date{'s' if failures != 1 else ''}" if failures else "")
+
+        # The engine slices the window soonest first; headings re-order it
+        events = self._sorted_events(store, engine.events(days_filter, dates), dates)
+
+        tree_rows = []
+        for reminder in engine.reminders(days_filter, dates, events):
+            row = reminder.row
+            values = [
+                f"AST-{row[0]}",  # Formatted Asset ID
+                row[28],  # Lease Manager
+                row[2],  # Property Name
+                row[3],  # Location
+                row[4],  # project
+                row[10],  # tower
+                row[11],  # Floor
+                row[12],  # unit no.
+                row[reminder.column],  # lease expiry (or event) date
+                f"{reminder.days_left:,}",  # Days remaining, formatted with commas
+                reminder.event,  # Event (date column the row is for)
+            ]
+            tree_rows.append((values, (reminder.status,)))
+
+        self.loader.show_rows(tree_rows)
+
+    def _sorted_events(self, store, events, dates):
+        heading = self.sorter.column
+        if heading is None:
+            return events
+        if dates == LEASE_EXPIRY:
+            expiry = store.expiry
+            return [(expiry[position], position, 14)
+                    for position in self.sorter.apply(store, [event[1] for event in events])]
+
+        if heading in ('Lease Expiry', 'Days Remaining'):
+            # The date headings sort by the event date, not the lease expiry
+            return events[::-1] if self.sorter.descending else events
+        if heading == 'Event':
+            labels = store.timeline().labels
+            return sorted(events, key=lambda event: labels[event[2]],
+                          reverse=self.sorter.descending)
+        rank = {position: order for order, position in
+                enumerate(self.sorter.apply(store, sorted({event[1] for event in events})))}
+        return sorted(events, key=lambda event: rank[event[1]])
+
+    def show_unreadable_dates(self):
+        store = self._store
+        if store is None or not store.expiry_failures:
+            return
 
-        # Set max_days for non-expired view
-        if days_filter.lower() == 'all':
-            max_days = float('inf')
-        elif days_filter.lower() == 'expired':
-            max_days = 0  # Not used for expired view
-        else:
-            max_days = int(days_filter)
-
-        for row in all_rows[1:]:
-            try:
-                date_str = row[14]
-                if date_str:
-                    date = parse(date_str).date()
-                    days_left = (date - today).days
-
-                    # Show row based on filter selection
-                    show_row = False
-                    if show_expired:
-                        # Only show expired leases when "Expired" is selected
-                        show_row = days_left <= 0
-                    else:
-                        # Only show non-expired leases for all other filters
-                        show_row = days_left > 0 and (days_filter.lower() == 'all' or days_left <= max_days)
-
-                    if show_row:
-                        values = [
-                            f"AST-{row[0]}",  # Formatted Asset ID
-                            row[28],  # Lease Manager
-                            row[2],  # Property Name
-                            row[3],  # Location
-                            row[4],  # project
-                            row[10],  # tower
-                            row[11],  # Floor
-                            row[12],  # unit no.
-                            row[14],  # lease expiry date
-                            days_left,  # Days remaining as integer
-                        ]
-
-                        item = self.tree.insert("", "end", values=values)
-
-                        # Apply status styles
-                        if show_expired:
-                            self.tree.tag_configure('expired', background=self.status_colors['expired'])
-                            self.tree.item(item, tags=('expired',))
-                        else:
-                            if days_left <= 15:
-                                self.tree.tag_configure('urgent', background=self.status_colors['urgent'])
-                                self.tree.item(item, tags=('urgent',))
-                            elif days_left <= 31:
-                                self.tree.tag_configure('warning', background=self.status_colors['warning'])
-                                self.tree.item(item, tags=('warning',))
-                            else:
-                                self.tree.tag_configure('normal', background=self.status_colors['normal'])
-                                self.tree.item(item, tags=('normal',))
-
-            except (ValueError, IndexError):
-                continue
-
-        # Sort by days remaining
-        sorted_items = sorted(self.tree.get_children(''),
-                              key=lambda x: int(self.tree.item(x)['values'][-1]))
-
-        # After sorting, update the display to show formatted values
-        for index, item in enumerate(sorted_items):
-            values = list(self.tree.item(item)['values'])
-            values[-1] = f"{values[-1]:,}"  # Format the days remaining with commas
-            self.tree.item(item, values=values)
-            self.tree.move(item, '', index)
+        limit = 20
+        lines = [f"Row {store.row_numbers[position]} (AST-{store.rows[position][0]}): "
+                 f"{store.rows[position][14]!r}"
+                 for position in store.expiry_failures[:limit]]
+        if len(store.expiry_failures) > limit:
+            lines.append(f"…and {len(store.expiry_failures) - limit:,} more")
+        messagebox.showwarning(
+            "Unreadable Dates",
+            "These rows have a lease expiry that is not a date (expected mm-dd-yyyy) "
+            "and are left out of reminders:\n\n" + "\n".join(lines))
 
     def show_asset_details(self, values):
-        assets = self.app.sheet.get_all_values()
-        headers = assets[0]
         # Find the full row data using Asset ID and Property Name
-        full_row = next((row for row in assets[1:] if row[0] == values[0].replace("AST-", "") and row[2] == values[2]),
-                        None)
-
-        if full_row:
-            details_window = tk.Toplevel(self.parent)
-            details_window.title("Asset Details")
-            details_window.geometry("700x600")
-            details_window.minsize(700, 600)
-
-            def on_window_close():
-                canvas.unbind_all("<MouseWheel>")
-                canvas.unbind_all("<Button-4>")
-                canvas.unbind_all("<Button-5>")
-                details_window.destroy()
-
-            details_window.protocol("WM_DELETE_WINDOW", on_window_close)
-
-            # Main container
-            main_container = ttk.Frame(details_window, style='Card.TFrame')
-            main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-
-            # Header with property name and asset ID
-            header_frame = ttk.Frame(main_container, style='DetailHeader.TFrame')
-            header_frame.pack(fill=tk.X, pady=(0, 15))
-
-            header_content = ttk.Frame(header_frame, style='DetailHeader.TFrame', padding=(15, 10))
-            header_content.pack(fill=tk.X)
-
-            title = ttk.Label(header_content,
-                              text=f"{full_row[4]}",
-                              style='DetailHeader.TLabel')
-            title.pack(side=tk.LEFT)
-
-            asset_id = ttk.Label(header_content,
-                                 text=f"ID: {full_row[0]}",
-                                 style='DetailHeader.TLabel')
-            asset_id.pack(side=tk.RIGHT)
-
-            # Create scrollable content area
-            content_frame = ttk.Frame(main_container, style='Card.TFrame')
-            content_frame.pack(fill=tk.BOTH, expand=True)
-
-            canvas = tk.Canvas(content_frame,
-                               bg=self.colors['surface'],
-                               highlightthickness=0)
-            scrollbar = ttk.Scrollbar(content_frame,
-                                      orient="vertical",
-                                      command=canvas.yview)
-            scrollable_frame = ttk.Frame(canvas, style='Card.TFrame')
-
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-            )
-
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw", width=canvas.winfo_width())
-            canvas.bind('<Configure>', lambda e: canvas.itemconfig(canvas.find_all()[0], width=e.width))
-
-            # Information groups
-            groups = {
-                'Basic Info': [0, 1, 2, 3, 4, 5],
-                'Property Details': [6, 7, 8, 9, 10],
-                'Lease Information': [11, 12, 13, 14, 15],
-                'Additional Details': [16, 17, 18, 19, 20]
-            }
-
-            # Add groups
-            for group_name, field_indices in groups.items():
-                group_frame = ttk.Frame(scrollable_frame, style='DetailRow.TFrame')
-                group_frame.pack(fill=tk.X, pady=5, padx=10)
-
-                ttk.Label(group_frame,
-                          text=group_name,
-                          style='DetailLabel.TLabel',
-                          font=('Segoe UI', 11, 'bold')).pack(anchor=tk.W, pady=(10, 5))
-
-                content_frame = ttk.Frame(group_frame, style='DetailRow.TFrame')
-                content_frame.pack(fill=tk.X, padx=15)
-
-                for idx in field_indices:
-                    if idx < len(headers) and idx < len(full_row):
-                        row = ttk.Frame(content_frame, style='DetailRow.TFrame')
-                        row.pack(fill=tk.X, pady=2)
-
-                        header_label = ttk.Label(row,
-                                                 text=f"{headers[idx]}:",
-                                                 style='DetailLabel.TLabel',
-                                                 width=20,
-                                                 anchor='e')
-                        header_label.pack(side=tk.LEFT, padx=(5, 10))
-
-                        value_label = ttk.Label(row,
-                                                text=str(full_row[idx] or '-'),
-                                                style='DetailValue.TLabel',
-                                                anchor='w')
-                        value_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-            # Document Details Section
-            doc_frame = ttk.Frame(scrollable_frame, style='DetailRow.TFrame')
-            doc_frame.pack(fill=tk.X, pady=5, padx=10)
-
-            ttk.Label(doc_frame,
-                      text="Document Details",
-                      style='DetailLabel.TLabel',
-                      font=('Segoe UI', 11, 'bold')).pack(anchor=tk.W, pady=(10, 5))
-
-            doc_content_frame = ttk.Frame(doc_frame, style='DetailRow.TFrame')
-            doc_content_frame.pack(fill=tk.X, padx=15)
-
-            # Document columns (X, Y, Z, AA, AB) - indices 23 to 27
-            for i in range(23, 28):
-                row = ttk.Frame(doc_content_frame, style='DetailRow.TFrame')
-                row.pack(fill=tk.X, pady=2)
-
-                header_label = ttk.Label(row,
-                                         text=f"{headers[i]}:",
-                                         style='DetailLabel.TLabel',
-                                         width=20,
-                                         anchor='e')
-                header_label.pack(side=tk.LEFT, padx=(5, 10))
-
-                value = str(full_row[i] or '-')
-                value_label = ttk.Label(row,
-                                        text=value,
-                                        style='DetailValue.TLabel',
-                                        anchor='w')
-
-                if value.upper().strip() not in ["UPLOADED", "NA"] and value.strip():
-                    row.configure(style='Warning.TFrame')
-                    value_label.configure(background=self.colors['warning'])
-
-                value_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-            # Bottom button frame
-            button_frame = ttk.Frame(main_container, style='Card.TFrame')
-            button_frame.pack(fill=tk.X, pady=(15, 0))
-
-            def open_drive_documents():
-                drive_link = full_row[29]  # Column AD contains the Google Drive folder link
-                if drive_link:
-                    response = messagebox.askyesno(
-                        "Open Documents",
-                        "You will be redirected to Google Drive to view the documents. Continue?",
-                        icon='question'
-                    )
-                    if response:
-                        webbrowser.open(drive_link)
-                else:
-                    messagebox.showwarning("No Documents", "No document folder link available for this asset.")
-
-            view_docs_button = ttk.Button(button_frame,
-                                          text="View Documents",
-                                          style="primary.TButton",
-                                          command=open_drive_documents,
-                                          width=15)
-            view_docs_button.pack(side=tk.LEFT, padx=(0, 10))
-
-            close_button = ttk.Button(button_frame,
-                                      text="Close",
-                                      style="primary.TButton",
-                                      command=on_window_close,
-                                      width=15)
-            close_button.pack(side=tk.RIGHT)
-
-            # Set up scrolling
-            canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=(0, 15))
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            canvas.configure(yscrollcommand=scrollbar.set)
-
-            self._setup_scroll_bindings(canvas)
-            self._center_window(details_window, 700, 600)
+        match = self.app.sheet_cache.lookup(values[0].replace("AST-", ""), name=values[2])
+
+        if match:
+            self.detail_view.show(*match)
         else:
             messagebox.showerror("Error", "Asset details not found.")
 
@@ -582,34 +509,6 @@ class Reminders:
         else:
             self.tree.configure(cursor="")
 
-    def _setup_scroll_bindings(self, canvas):
-        def _bind_to_mousewheel(event):
-            canvas.bind_all("<MouseWheel>", _on_mousewheel)
-            canvas.bind_all("<Button-4>", _on_mousewheel)
-            canvas.bind_all("<Button-5>", _on_mousewheel)
-
-        def _unbind_from_mousewheel(event=None):
-            canvas.unbind_all("<MouseWheel>")
-            canvas.unbind_all("<Button-4>")
-            canvas.unbind_all("<Button-5>")
-
-        def _on_mousewheel(event):
-            if event.num == 4 or event.delta > 0:
-                canvas.yview_scroll(-1, "units")
-            elif event.num == 5 or event.delta < 0:
-                canvas.yview_scroll(1, "units")
-
-        canvas.bind('<Enter>', _bind_to_mousewheel)
-        canvas.bind('<Leave>', _unbind_from_mousewheel)
-        canvas.winfo_toplevel().bind('<Destroy>', _unbind_from_mousewheel)
-
-    def _center_window(self, window, width, height):
-        screen_width = window.winfo_screenwidth()
-        screen_height = window.winfo_screenheight()
-        x = (screen_width - width) // 2
-        y = (screen_height - height) // 2
-        window.geometry(f"{width}x{height}+{x}+{y}")
-
     def _on_mousewheel(self, event):
         """Handle mousewheel scrolling for the Treeview"""
         # For Windows
@@ -623,4 +522,4 @@ class Reminders:
         else:
             return
 
-        self.tree.yview_scroll(move, "units")
+        self.loader.scroll(move)
@@ -0,0 +1,173 @@
+import bisect
+import re
+import threading
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Property name, location, project, tower and lease manager
+FUZZY_COLUMNS = (2, 3, 4, 10, 28)
+
+
+def tokenize(text):
+    """Split a cell or query into lowercased word tokens"""
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def trigrams(token):
+    """Character trigrams of a token, padded so word edges count"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Inverted index from word tokens to sheet row numbers.
+
+    The index follows the SheetCache snapshot: sync() compares the new
+    snapshot against the rows it already holds and re-tokenizes only the
+    rows that changed. A query matches rows containing, for every query
+    term, some token that starts with that term.
+
+    Tokens from the FUZZY_COLUMNS are also indexed by trigram so misspelt
+    names can be matched by similarity with fuzzy_search().
+    """
+
+    def __init__(self):
+        self.version = None
+        self.rows = {}         # row number -> row as last indexed
+        self.row_tokens = {}   # row number -> set of tokens in that row
+        self.postings = {}     # token -> set of row numbers
+        self.fuzzy_tokens = {}     # row number -> tokens from the fuzzy columns
+        self.fuzzy_postings = {}   # fuzzy column token -> set of row numbers
+        self.trigram_tokens = {}   # trigram -> set of fuzzy column tokens
+        self._vocabulary = None
+        self._lock = threading.Lock()
+
+    def sync(self, values, version):
+        """Bring the index in line with snapshot ``values`` (header row included)"""
+        with self._lock:
+            if version == self.version:
+                return
+
+            current = dict(enumerate(values[1:], start=2)) if values else {}
+            for row_number in [n for n in self.rows if n not in current]:
+                self._remove(row_number)
+            for row_number, row in current.items():
+                if self.rows.get(row_number) != row:
+                    self._remove(row_number)
+                    self._add(row_number, row)
+
+            self.version = version
+
+    def _add(self, row_number, row):
+        tokens = set()
+        for value in row:
+            tokens.update(tokenize(value))
+
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = set()
+                self._vocabulary = None
+            posting.add(row_number)
+
+        fuzzy_tokens = set()
+        for idx in FUZZY_COLUMNS:
+            if idx < len(row):
+                fuzzy_tokens.update(tokenize(row[idx]))
+
+        for token in fuzzy_tokens:
+            posting = self.fuzzy_postings.get(token)
+            if posting is None:
+                posting = self.fuzzy_postings[token] = set()
+                for gram in trigrams(token):
+                    self.trigram_tokens.setdefault(gram, set()).add(token)
+            posting.add(row_number)
+
+        self.rows[row_number] = row
+        self.row_tokens[row_number] = tokens
+        self.fuzzy_tokens[row_number] = fuzzy_tokens
+
+    def _remove(self, row_number):
+        self.rows.pop(row_number, None)
+        for token in self.row_tokens.pop(row_number, ()):
+            posting = self.postings[token]
+            posting.discard(row_number)
+            if not posting:
+                del self.postings[token]
+                self._vocabulary = None
+
+        for token in self.fuzzy_tokens.pop(row_number, ()):
+            posting = self.fuzzy_postings[token]
+            posting.discard(row_number)
+            if not posting:
+                del self.fuzzy_postings[token]
+                for gram in trigrams(token):
+                    grams = self.trigram_tokens[gram]
+                    grams.discard(token)
+                    if not grams:
+                        del self.trigram_tokens[gram]
+
+    def _prefix_matches(self, term):
+        # Sorted vocabulary turns prefix expansion into a bisect plus a short scan
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+
+        matches = set()
+        i = bisect.bisect_left(self._vocabulary, term)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(term):
+            matches |= self.postings[self._vocabulary[i]]
+            i += 1
+        return matches
+
+    def search(self, query):
+        """Return the sorted row numbers matching every term in ``query``"""
+        terms = set(tokenize(query))
+        with self._lock:
+            if not terms:
+                return sorted(self.rows)
+
+            result = None
+            # Longer terms expand to fewer tokens, so intersect them first
+            for term in sorted(terms, key=len, reverse=True):
+                matches = self._prefix_matches(term)
+                result = matches if result is None else result & matches
+                if not result:
+                    return []
+            return sorted(result)
+
+    def fuzzy_search(self, query, threshold=0.3):
+        """Rank rows by trigram similarity of ``query`` to the fuzzy columns.
+
+        Each query term is scored by its best Jaccard similarity to a token
+        in the row; a row's score is the mean over the terms. Returns
+        (row number, score) pairs at or above ``threshold``, best first.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        scores = {}
+        with self._lock:
+            for term in terms:
+                grams = trigrams(term)
+                shared = {}
+                for gram in grams:
+                    for token in self.trigram_tokens.get(gram, ()):
+                        shared[token] = shared.get(token, 0) + 1
+
+                best = {}
+                for token, count in shared.items():
+                    similarity = count / (len(grams) + len(trigrams(token)) - count)
+                    if similarity < threshold:
+                        continue
+                    for row_number in self.fuzzy_postings[token]:
+                        if similarity > best.get(row_number, 0):
+                            best[row_number] = similarity
+
+                for row_number, similarity in best.items():
+                    scores[row_number] = scores.get(row_number, 0) + similarity
+
+        ranked = [(row_number, score / len(terms)) for row_number, score in scores.items()
+                  if score / len(terms) >= threshold]
+        ranked.sort(key=lambda match: (-match[1], match[0]))
+        return ranked
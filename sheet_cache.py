@@ -0,0 +1,337 @@
+import threading
+import time
+from search_index import SearchIndex
+from column_store import ColumnStore
+
+
+def column_index(letter):
+    """Convert a column letter ("A", "AC") to a zero-based index"""
+    index = 0
+    for char in letter.strip().upper():
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def column_letter(index):
+    """Convert a zero-based column index to its letter"""
+    letter = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letter = chr(ord('A') + remainder) + letter
+    return letter
+
+
+def parse_columns(spec):
+    """Expand a column spec such as ("A", "C:E", "AC") into sorted column indices"""
+    indices = set()
+    for part in spec:
+        if ':' in part:
+            start, end = part.split(':')
+            indices.update(range(column_index(start), column_index(end) + 1))
+        else:
+            indices.add(column_index(part))
+    return sorted(indices)
+
+
+def column_runs(indices):
+    """Group sorted column indices into runs of adjacent columns"""
+    runs = []
+    for idx in indices:
+        if runs and runs[-1][-1] == idx - 1:
+            runs[-1].append(idx)
+        else:
+            runs.append([idx])
+    return runs
+
+
+class SheetCache:
+    """Shared, versioned snapshot of the asset sheet.
+
+    Every tab reads sheet values through this cache so a refresh cycle costs a
+    single get_all_values() call instead of one per tab. The snapshot is
+    reused until it is older than ``ttl`` seconds or explicitly invalidated
+    after a write. When a mirror is attached, every fetched snapshot is synced
+    into it.
+
+    Tabs that only need some columns can refresh them with get_columns().
+    While the last full read is younger than ``ttl`` but the snapshot has
+    been invalidated, just those ranges are fetched in one batch_get and
+    merged in, provided the Asset ID column still lines up with the sheet.
+    A forced refresh, or an older snapshot, always reads the whole sheet, so
+    columns no tab asks for never fall more than ``ttl`` behind. Merged
+    snapshots are never written to the mirror.
+
+    Each snapshot also carries a lookup index from Asset ID and from
+    (Asset ID, Property Name) to the row and its sheet row number, so detail
+    windows can find an asset without touching the network. A token search
+    index and a typed ColumnStore are kept in step with the snapshot on
+    demand.
+    """
+
+    def __init__(self, sheet, ttl=300, mirror=None, headers=None):
+        self.sheet = sheet
+        # Full header row (row_values(1)), for finding columns by name
+        self.sheet_headers = headers
+        self.ttl = ttl
+        self.mirror = mirror
+        self.version = 0
+        self._values = None
+        self._fetched_at = None          # time of the last full read
+        self._invalidated = False
+        self._current_columns = set()    # columns re-read since the snapshot was invalidated
+        self._by_id = {}
+        self._by_id_name = {}
+        self._next_asset_id = 0
+        self._search_index = SearchIndex()
+        self._column_store = None
+        self._listeners = []
+        self._lock = threading.RLock()
+        self._fetch_lock = threading.Lock()
+
+    def is_fresh(self, columns=None):
+        if self._values is None or not self._full_read_is_fresh():
+            return False
+        if not self._invalidated:
+            return True
+        if columns is None:
+            return False
+        return self._current_columns.issuperset(columns)
+
+    def _full_read_is_fresh(self):
+        return self._fetched_at is not None and (time.monotonic() - self._fetched_at) < self.ttl
+
+    def seed(self, values):
+        """Install a locally stored snapshot (e.g. from the mirror) without a network call"""
+        with self._lock:
+            self._install(values)
+            self._mark_fetched()
+
+    def get_all_values(self, force=False):
+        """Return the full sheet (header row included), fetching only when needed"""
+        if not force and self.is_fresh():
+            return self._values
+
+        with self._fetch_lock:
+            # Another thread may have refreshed the snapshot while we waited
+            if not force and self.is_fresh():
+                return self._values
+            return self._fetch_all()
+
+    def _mark_fetched(self):
+        # Caller holds _lock
+        self._fetched_at = time.monotonic()
+        self._invalidated = False
+        self._current_columns = set()
+
+    def _fetch_all(self):
+        # Caller holds _fetch_lock
+        values = self.sheet.get_all_values()
+        with self._lock:
+            self._install(values)
+            self._mark_fetched()
+
+        if self.mirror is not None:
+            self.mirror.sync(values)
+
+        return values
+
+    def get_columns(self, spec, force=False):
+        """Return the snapshot with at least the columns in ``spec`` current.
+
+        Between full reads, only the requested column ranges (plus column A)
+        are downloaded, in a single batch_get; other columns keep the values
+        of the last full read. A forced refresh, a snapshot whose full read
+        is older than ``ttl``, or a column A showing rows were added, removed
+        or moved reads the whole sheet instead.
+        """
+        indices = parse_columns(spec)
+        if not force and self.is_fresh(indices):
+            return self._values
+
+        with self._fetch_lock:
+            if not force and self.is_fresh(indices):
+                return self._values
+
+            if force or not self._full_read_is_fresh():
+                return self._fetch_all()
+
+            # Column A rides along so we can tell whether the rows still line up
+            runs = column_runs(sorted(set(indices) | {0}))
+            ranges = [f"{column_letter(run[0])}:{column_letter(run[-1])}" for run in runs]
+            results = self.sheet.batch_get(ranges)
+
+            with self._lock:
+                if not self._rows_line_up(results[0]):
+                    values = None
+                else:
+                    values = self._merge_columns(runs, results)
+                    self._install(values)
+                    self._current_columns.update(indices)
+            if values is None:
+                return self._fetch_all()
+
+            # The other columns are only as fresh as the last full read, so the
+            # mirror keeps that read rather than this mix
+            return values
+
+    def _rows_line_up(self, fetched):
+        # Compare the Asset IDs just fetched (column A first) with the snapshot's
+        def ids(rows):
+            column = [row[0] if row else '' for row in rows]
+            while column and not column[-1]:
+                column.pop()
+            return column
+        return ids(fetched) == ids(self._values)
+
+    def _install(self, values):
+        # Swap in a new snapshot and rebuild its lookup index
+        by_id = {}
+        by_id_name = {}
+        max_asset_id = 0
+        for row_number, row in enumerate(values[1:], start=2):
+            if not row:
+                continue
+            if row[0].isdigit():
+                max_asset_id = max(max_asset_id, int(row[0]))
+            entry = (row_number, row)
+            by_id.setdefault(row[0], []).append(entry)
+            if len(row) > 2:
+                by_id_name.setdefault((row[0], row[2]), entry)
+
+        self._values = values
+        self._by_id = by_id
+        self._by_id_name = by_id_name
+        # Never hand out an ID twice, even if the new snapshot lags behind
+        self._next_asset_id = max(max_asset_id, self._next_asset_id)
+        self.version += 1
+        for listener in self._listeners:
+            listener(self.version)
+
+    def add_listener(self, callback):
+        """Call ``callback(version)`` whenever a new snapshot is installed.
+
+        It runs on whichever thread installed the snapshot, with the cache
+        locked, so it should only hand off (e.g. through IOWorker.call_soon).
+        """
+        self._listeners.append(callback)
+
+    def _merge_columns(self, runs, results):
+        base = self._values
+        height = max([len(base)] + [len(result) for result in results])
+        width = max([len(base[0]) if base else 0] + [run[-1] + 1 for run in runs])
+
+        merged = []
+        for r in range(height):
+            row = list(base[r]) if r < len(base) else []
+            row.extend([''] * (width - len(row)))
+            for run, result in zip(runs, results):
+                fetched = result[r] if r < len(result) else []
+                for k, idx in enumerate(run):
+                    row[idx] = fetched[k] if k < len(fetched) else ''
+            merged.append(row)
+        return merged
+
+    def ensure_loaded(self):
+        # Reuse whatever snapshot we hold, however old; only fetch if there is none
+        if self._values is None:
+            self.get_all_values()
+
+    @property
+    def loaded(self):
+        """True once a snapshot is held, so lookups will not touch the network"""
+        return self._values is not None
+
+    @property
+    def headers(self):
+        self.ensure_loaded()
+        return self._values[0] if self._values else []
+
+    def lookup(self, asset_id, name=None):
+        """Return (sheet row number, row) for an asset, or None if unknown"""
+        self.ensure_loaded()
+        if name is not None:
+            return self._by_id_name.get((asset_id, name))
+        matches = self._by_id.get(asset_id)
+        return matches[0] if matches else None
+
+    def lookup_all(self, asset_id):
+        """Return every (sheet row number, row) sharing an Asset ID"""
+        self.ensure_loaded()
+        return list(self._by_id.get(asset_id, []))
+
+    def search_index(self):
+        """Return the token search index, updated to the current snapshot"""
+        self.ensure_loaded()
+        with self._lock:
+            values, version = self._values, self.version
+        self._search_index.sync(values, version)
+        return self._search_index
+
+    def column_store(self):
+        """Return the typed column arrays for the current snapshot"""
+        self.ensure_loaded()
+        with self._lock:
+            if self._column_store is None or self._column_store.version != self.version:
+                self._column_store = ColumnStore(self._values, self.version, headers=self.sheet_headers)
+            return self._column_store
+
+    def apply_cells(self, cells):
+        """Patch (row, col, value) writes, 1-indexed like the sheet, into the snapshot"""
+        with self._lock:
+            if self._values is None:
+                return
+            values = list(self._values)
+            touched = {}
+            for row, col, value in cells:
+                if row - 1 >= len(values):
+                    continue
+                patched = list(values[row - 1])
+                patched.extend([''] * (col - len(patched)))
+                patched[col - 1] = value if isinstance(value, str) else str(value)
+                values[row - 1] = touched[row] = patched
+            self._install(values)
+
+        if self.mirror is not None and touched:
+            self.mirror.upsert_rows(touched.items())
+
+    def append_local(self, row_number, row):
+        """Record a row the server appended at ``row_number``.
+
+        If the sheet grew behind our back the row number will not line up with
+        our row count; the snapshot is then invalidated and False returned.
+        """
+        with self._lock:
+            if self._values is None:
+                return False
+            if row_number != len(self._values) + 1:
+                # Rows moved under us, so a column merge would not line up
+                self._fetched_at = None
+                return False
+            row = [value if isinstance(value, str) else str(value) for value in row]
+            self._install(self._values + [row])
+
+        if self.mirror is not None:
+            self.mirror.upsert_rows([(row_number, row)])
+        return True
+
+    def allocate_asset_id(self):
+        """Hand out the next numeric Asset ID without reading the sheet"""
+        self.ensure_loaded()
+        with self._lock:
+            self._next_asset_id += 1
+            return self._next_asset_id
+
+    def refresh(self, force=False, columns=None):
+        """Make sure the snapshot (and mirror) is current; returns the snapshot version"""
+        if columns is None:
+            self.get_all_values(force=force)
+        else:
+            self.get_columns(columns, force=force)
+        return self.version
+
+    def invalidate(self):
+        """Mark the snapshot stale so the next read refetches what it needs"""
+        with self._lock:
+            self._invalidated = True
+            self._current_columns = set()
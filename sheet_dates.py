@@ -0,0 +1,50 @@
+import datetime
+import re
+from dateutil.parser import parse
+
+# set_date_format makes the sheet render dates as mm-dd-yyyy
+SHEET_DATE_RE = re.compile(r'(\d{1,2})-(\d{1,2})-(\d{4})')
+
+# Parsed results keyed by the raw cell text; _UNREADABLE marks failures
+_memo = {}
+_UNREADABLE = object()
+MEMO_LIMIT = 100000
+
+
+def _parse(text):
+    match = SHEET_DATE_RE.fullmatch(text)
+    if match:
+        # Strict fast path: a mm-dd-yyyy string must be a real date
+        month, day, year = (int(part) for part in match.groups())
+        return datetime.date(year, month, day).toordinal()
+    try:
+        return parse(text).date().toordinal()
+    except OverflowError as e:
+        raise ValueError(str(e))
+
+
+def date_ordinal(text):
+    """Proleptic ordinal of a sheet date cell.
+
+    Returns None for a blank cell and raises ValueError when the text is not
+    a date. mm-dd-yyyy is parsed directly; anything else goes to dateutil.
+    Results are memoized by the raw text, so each distinct value is parsed
+    once per session.
+    """
+    result = _memo.get(text)
+    if result is None and text not in _memo:
+        stripped = text.strip()
+        if not stripped:
+            result = None
+        else:
+            try:
+                result = _parse(stripped)
+            except ValueError:
+                result = _UNREADABLE
+        if len(_memo) >= MEMO_LIMIT:
+            _memo.clear()
+        _memo[text] = result
+
+    if result is _UNREADABLE:
+        raise ValueError(f"Unreadable date: {text!r}")
+    return result
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+
+def default_mirror_path():
+    return os.path.join(os.path.expanduser("~"), ".assetra", "sheet_mirror.sqlite3")
+
+
+def row_hash(row):
+    return hashlib.sha1(json.dumps(row, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class SheetMirror:
+    """Persistent SQLite copy of sheet1, used as a cold-start cache.
+
+    On launch the shared snapshot is seeded from here so the tabs render
+    before the first sheet read lands; the headless reminders report reads
+    it too. Rows are keyed by their sheet row number and carry a content
+    hash, so a sync only rewrites rows whose values actually changed. The
+    tabs search, filter and count on the in-memory ColumnStore and search
+    index rather than with SQL, so nothing else is stored or indexed.
+    """
+
+    ROW_COLUMNS = ('row_number', 'row_hash', 'data')
+
+    def __init__(self, path=None):
+        self.path = path or default_mirror_path()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )""")
+            # Mirrors from older versions carried extra indexed columns; the
+            # mirror is only a cache, so drop it and let the next sync refill it
+            columns = tuple(name for _, name, *_ in self.conn.execute("PRAGMA table_info(rows)"))
+            if columns and columns != self.ROW_COLUMNS:
+                self.conn.execute("DROP TABLE rows")
+                self.conn.execute("DELETE FROM meta WHERE key = 'headers'")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS rows (
+                    row_number INTEGER PRIMARY KEY,
+                    row_hash TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )""")
+
+    def sync(self, values):
+        """Bring the mirror in line with a full sheet read (header row included).
+
+        Returns a (changed, deleted) tuple of row counts.
+        """
+        if not values:
+            return 0, 0
+
+        headers, data_rows = values[0], values[1:]
+        with self._lock, self.conn:
+            existing = dict(self.conn.execute("SELECT row_number, row_hash FROM rows"))
+
+            changed = []
+            for row_number, row in enumerate(data_rows, start=2):
+                digest = row_hash(row)
+                if existing.get(row_number) != digest:
+                    changed.append(self._record(row_number, row, digest))
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rows VALUES (?, ?, ?)", changed)
+
+            # Rows past the end of the sheet were removed upstream
+            last_row = len(data_rows) + 1
+            deleted = sum(1 for row_number in existing if row_number > last_row)
+            self.conn.execute("DELETE FROM rows WHERE row_number > ?", (last_row,))
+
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('headers', ?)",
+                              (json.dumps(headers, ensure_ascii=False),))
+
+        return len(changed), deleted
+
+    def upsert_rows(self, rows):
+        """Write individual (row_number, row) pairs after a local edit or append"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rows VALUES (?, ?, ?)",
+                [self._record(row_number, row, row_hash(row)) for row_number, row in rows])
+
+    def _record(self, row_number, row, digest):
+        return row_number, digest, json.dumps(row, ensure_ascii=False)
+
+    def load(self):
+        """Return the mirrored sheet in get_all_values() shape, or None when empty"""
+        with self._lock:
+            header = self.conn.execute("SELECT value FROM meta WHERE key = 'headers'").fetchone()
+            if header is None:
+                return None
+            rows = self.conn.execute("SELECT data FROM rows ORDER BY row_number")
+            return [json.loads(header[0])] + [json.loads(data) for (data,) in rows]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,14 @@
+"""Sheet rows for tests: a full header row and a helper to fill in cells"""
+
+def make_row(width=30, **cells):
+    """A sheet row of ``width`` blank cells with some filled in, e.g. make_row(c0='1', c14='01-31-2025')"""
+    row = [''] * width
+    for name, value in cells.items():
+        row[int(name[1:])] = value
+    return row
+
+
+HEADERS = make_row(c0="Asset ID", c1="Date ", c2="Property Name", c3="Location", c4="Project",
+                   c13="commenment Date", c14="Lease Expiry", c15="Lock in expiry",
+                   c20="Tenant", c22="Brokerage", c23="KYC", c24="Tenent Verification",
+                   c25="Property tax", c26="Lease upload", c27="Cheque PDC", c28="Lease Manager")
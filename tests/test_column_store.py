@@ -0,0 +1,101 @@
+import datetime
+
+from column_store import ColumnStore, ExpiryIndex, missing_documents, natural_key
+from sheet_rows import HEADERS, make_row
+
+DAY = datetime.date(2025, 1, 1).toordinal()
+
+
+def on(days):
+    return datetime.date.fromordinal(DAY + days).strftime("%m-%d-%Y")
+
+
+def test_natural_key_orders_numbers_by_value():
+    names = ["Unit 10", "unit 9", "Unit 100"]
+    assert sorted(names, key=natural_key) == ["unit 9", "Unit 10", "Unit 100"]
+    assert natural_key("  ") is None
+
+
+def test_missing_documents_bitmask():
+    row = make_row(c23="UPLOADED", c24="na", c25="", c26="PENDING", c27="NA")
+    assert missing_documents(row) == 0b01100
+    assert missing_documents(["1"]) == 0b11111  # short rows miss every document
+
+
+def test_missing_counts_per_document():
+    store = ColumnStore([HEADERS,
+                         make_row(c0="1", c23="UPLOADED", c24="UPLOADED", c25="UPLOADED",
+                                  c26="UPLOADED", c27="UPLOADED"),
+                         make_row(c0="2", c23="UPLOADED")], 1)
+    assert store.missing_docs == [0, 0b11110]
+    assert store.missing_counts == [0, 1, 1, 1, 1]
+
+
+def test_text_columns_and_value_indexes():
+    store = ColumnStore([HEADERS,
+                         make_row(c0="1", c3="Gurgaon", c20="Acme", c22="Received"),
+                         make_row(c0="2", c3="Noida")], 1)
+    assert store.text['location'] == ["gurgaon", "noida"]
+    assert store.text['brokerage'] == ["received", "pending"]
+    assert store.indexes['status'] == {'occupied': {0}, 'vacant': {1}}
+    assert store.row_numbers == [2, 3]
+
+
+def test_unreadable_expiry_is_reported_not_dropped():
+    store = ColumnStore([HEADERS,
+                         make_row(c0="1", c14="01-06-2025"),
+                         make_row(c0="2", c14="soon"),
+                         make_row(c0="3")], 1)
+    assert store.expiry == [datetime.date(2025, 1, 6).toordinal(), None, None]
+    assert store.expiry_failures == [1]
+    assert len(store) == 3
+
+
+def test_sort_puts_blanks_last_both_ways():
+    store = ColumnStore([HEADERS,
+                         make_row(c0="1", c12="Unit 10"),
+                         make_row(c0="2"),
+                         make_row(c0="3", c12="Unit 9")], 1)
+    assert store.permutation(12) == [2, 0, 1]
+    assert store.permutation(12, descending=True) == [0, 2, 1]
+    assert store.sort([1, 0], 12) == [0, 1]
+
+
+def test_permutations_are_cached_per_snapshot():
+    store = ColumnStore([HEADERS, make_row(c0="2"), make_row(c0="10")], 1)
+    assert store.permutation(0) is store.permutation(0)
+    assert store.permutation(0) == [0, 1]
+
+
+def test_date_columns_sort_by_date_not_text():
+    store = ColumnStore([HEADERS,
+                         make_row(c0="1", c15="12-01-2024"),
+                         make_row(c0="2", c15="02-01-2025")], 1)
+    assert 15 in store.date_columns
+    assert store.permutation(15, descending=True) == [1, 0]
+
+
+def test_expiry_index_windows():
+    index = ExpiryIndex([DAY + 40, None, DAY + 10, DAY - 3, DAY + 10])
+    start, end = index.between(DAY, DAY + 30)
+    assert index.positions[start:end] == [2, 4]
+    assert index.positions[:index.bound(DAY)] == [3]
+    assert len(index) == 4
+
+
+def test_timeline_spans_every_date_column():
+    store = ColumnStore([HEADERS,
+                         make_row(c0="1", c13=on(2), c14=on(50), c15=on(20)),
+                         make_row(c0="2", c1=on(-5), c15=on(7))], 1)
+    timeline = store.timeline()
+    assert timeline.labels == {1: "Date", 13: "Commencement", 14: "Lease Expiry", 15: "Lock-in Expiry"}
+    assert timeline.between(DAY, DAY + 30) == [(DAY + 2, 0, 13), (DAY + 7, 1, 15), (DAY + 20, 0, 15)]
+    assert timeline.between(DAY, DAY + 30, [15]) == [(DAY + 7, 1, 15), (DAY + 20, 0, 15)]
+    assert len(timeline) == 5
+
+
+def test_headers_can_come_from_the_full_header_row():
+    # A partial snapshot's own header row may be blank where columns were not fetched
+    blank_headers = make_row(c14="Lease Expiry")
+    store = ColumnStore([blank_headers, make_row(c0="1", c15=on(3))], 1, headers=HEADERS)
+    assert 15 in store.date_columns
@@ -0,0 +1,85 @@
+import datetime
+
+import pytest
+
+from column_store import ColumnStore
+from filter_query import FilterQueryError, compile_query
+from search_index import SearchIndex
+from sheet_rows import HEADERS, make_row
+
+
+def on(days):
+    return (datetime.date.today() + datetime.timedelta(days=days)).strftime("%m-%d-%Y")
+
+
+VALUES = [
+    HEADERS,
+    make_row(c0="1", c2="Cyber Hub", c3="Gurgaon", c14=on(20), c20="Acme", c22="Received",
+             c28="R Sharma"),
+    make_row(c0="2", c2="Cyber City", c3="Gurgaon", c14=on(200), c28="A Gupta"),
+    make_row(c0="3", c2="Sector 18", c3="Noida", c14=on(-10), c12="15"),
+    make_row(c0="4", c2="Blank Expiry", c3="Noida", c12="4"),
+]
+
+
+@pytest.fixture
+def store():
+    return ColumnStore(VALUES, 1)
+
+
+def test_compile_splits_clauses_and_terms():
+    query = compile_query('Location:Gurgaon cyber manager:"R Sharma"')
+    assert [(c.field, c.op, c.value) for c in query.clauses] == [
+        ('location', ':', 'gurgaon'), ('manager', ':', 'r sharma')]
+    assert query.terms == ['cyber']
+
+
+@pytest.mark.parametrize("text", ["10:30", "https://drive.google.com/x", "colour:red"])
+def test_unknown_fields_are_free_text(text):
+    query = compile_query(f"location:gurgaon {text}")
+    assert [c.field for c in query.clauses] == ['location']
+    assert query.terms == [text.lower()]
+
+
+@pytest.mark.parametrize("text", ["expiry<soon", "expiry>13-01-2025", "expiry<9", "expiry<2025-02-30"])
+def test_bad_dates_are_errors(text):
+    with pytest.raises(FilterQueryError, match="Not a date"):
+        compile_query(text)
+
+
+def test_substring_and_exact_clauses(store):
+    assert compile_query("location:gur").run(store) == [2, 3]
+    assert compile_query("location=gur").run(store) == []
+    assert compile_query("name=cyber hub").run(store) == []  # unquoted values stop at spaces
+    assert compile_query('name="cyber hub"').run(store) == [2]
+
+
+def test_indexed_fields(store):
+    assert compile_query("status:vacant").run(store) == [3, 4, 5]
+    assert compile_query("brokerage:pending location:noida").run(store) == [4, 5]
+
+
+def test_relative_dates(store):
+    assert compile_query("expiry<90d").run(store) == [2, 4]
+    assert compile_query("expiry>=0d").run(store) == [2, 3]
+    assert compile_query("expiry<-1w").run(store) == [4]
+
+
+def test_absolute_dates(store):
+    cutoff = (datetime.date.today() + datetime.timedelta(days=100)).strftime("%m-%d-%Y")
+    assert compile_query(f"expiry>{cutoff}").run(store) == [3]
+    iso = (datetime.date.today() + datetime.timedelta(days=100)).isoformat()
+    assert compile_query(f"expiry>{iso}").run(store) == [3]
+
+
+def test_numeric_comparison(store):
+    assert compile_query("unit>10").run(store) == [4]
+    assert compile_query("unit<=4").run(store) == [5]
+
+
+def test_terms_use_the_search_index(store):
+    index = SearchIndex()
+    index.sync(VALUES, 1)
+    assert compile_query("cyber location:gurgaon").run(store, index) == [2, 3]
+    assert compile_query("sector").run(store, index) == [4]
+    assert compile_query("location:noida 18:sector").run(store, index) == [4]
@@ -0,0 +1,118 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+
+import reminder_engine
+from column_store import ColumnStore
+from reminder_engine import ALL_DATES, ReminderEngine, write_csv, write_json, write_text
+from sheet_rows import HEADERS, make_row
+
+TODAY = datetime.date(2025, 1, 1)
+
+
+def on(days):
+    return (TODAY + datetime.timedelta(days=days)).strftime("%m-%d-%Y")
+
+
+VALUES = [
+    HEADERS,
+    make_row(c0="1", c2="Cyber Hub", c14=on(10), c15=on(45), c28="R Sharma"),
+    make_row(c0="2", c2="Cyber City", c14=on(25), c28="A Gupta"),
+    make_row(c0="3", c2="Sector 18", c14=on(50), c28="r sharma"),
+    make_row(c0="4", c2="Old Lease", c14=on(-3)),
+    # Trailing blank cells trimmed by the API
+    ["5", "", "Short Row", "", "", "", "", "", "", "", "", "", "", "", on(5)],
+]
+
+
+@pytest.fixture
+def engine():
+    return ReminderEngine(ColumnStore(VALUES, 1), today=TODAY.toordinal())
+
+
+def test_window_bounds(engine):
+    today = TODAY.toordinal()
+    assert engine.bounds("30") == (today, today + 30)
+    assert engine.bounds("All") == (today, float('inf'))
+    assert engine.bounds("expired") == (float('-inf'), today)
+
+
+def test_lease_expiry_window_is_soonest_first(engine):
+    assert [position for _, position, _ in engine.events("30")] == [4, 0, 1]
+    assert [position for _, position, _ in engine.events("Expired")] == [3]
+
+
+def test_status_buckets(engine):
+    statuses = {r.row[0]: r.status for r in engine.reminders("60")}
+    assert statuses == {"5": "urgent", "1": "urgent", "2": "warning", "3": "normal"}
+    assert [r.status for r in engine.reminders("Expired")] == ["expired"]
+
+
+def test_status_bucket_edges(engine):
+    today = TODAY.toordinal()
+    assert engine.status(today + 15) == 'urgent'
+    assert engine.status(today + 16) == 'warning'
+    assert engine.status(today + 31) == 'warning'
+    assert engine.status(today + 32) == 'normal'
+
+
+def test_other_date_types(engine):
+    events = engine.events("60", "Lock-in Expiry")
+    assert [(position, column) for _, position, column in events] == [(0, 15)]
+    assert len(engine.events("60", ALL_DATES)) == 5
+
+
+def test_short_rows_are_padded(engine):
+    reminder = next(r for r in engine.reminders("30") if r.row[0] == "5")
+    assert reminder.manager == "Unassigned"
+    assert reminder.fields()["Micro Market"] == "Short Row"
+
+
+def test_digest_groups_by_manager(engine):
+    digest = engine.digest("60")
+    assert [manager for manager, _ in digest] == ["A Gupta", "R Sharma", "r sharma", "Unassigned"]
+    assert [manager for manager, _ in engine.digest("60", manager="a gupta")] == ["A Gupta"]
+
+
+def test_csv_output(engine):
+    out = io.StringIO()
+    write_csv(engine.digest("30"), out)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row["Asset ID"] for row in rows] == ["AST-2", "AST-1", "AST-5"]
+    assert rows[0]["Days Remaining"] == "25"
+
+
+def test_json_output(engine):
+    out = io.StringIO()
+    write_json(engine.digest("30"), out, "30", "Lease Expiry", TODAY.toordinal())
+    report = json.loads(out.getvalue())
+    assert report["generated"] == "2025-01-01"
+    assert [group["manager"] for group in report["managers"]] == ["A Gupta", "R Sharma", "Unassigned"]
+
+
+def test_text_output(engine):
+    out = io.StringIO()
+    write_text(engine.digest("Expired"), out, "Expired", "Lease Expiry")
+    assert "Lease Expiry reminders (expired)" in out.getvalue()
+    assert "(3 days ago) [expired]" in out.getvalue()
+
+    out = io.StringIO()
+    write_text([], out, "30", "Lease Expiry")
+    assert "Nothing due." in out.getvalue()
+
+
+def test_cli_reads_a_snapshot(tmp_path, capsys):
+    snapshot = tmp_path / "sheet.json"
+    snapshot.write_text(json.dumps(VALUES))
+    output = tmp_path / "report.csv"
+    assert reminder_engine.main(["--snapshot", str(snapshot), "--today", "2025-01-01",
+                                 "--days", "30", "--format", "csv", "-o", str(output)]) == 0
+    assert output.read_text().count("AST-") == 3
+
+
+def test_cli_rejects_refresh_without_credentials(tmp_path):
+    with pytest.raises(SystemExit):
+        reminder_engine.main(["--refresh", "--mirror", str(tmp_path / "m.sqlite3")])
@@ -0,0 +1,58 @@
+from search_index import SearchIndex, tokenize, trigrams
+from sheet_rows import HEADERS, make_row
+
+
+def build(rows, version=1):
+    index = SearchIndex()
+    index.sync([HEADERS] + rows, version)
+    return index
+
+
+def test_tokenize_lowercases_words():
+    assert tokenize("DLF Phase-2, Tower B") == ["dlf", "phase", "2", "tower", "b"]
+
+
+def test_search_matches_every_term_by_prefix():
+    index = build([make_row(c0="1", c2="Cyber Hub", c3="Gurgaon"),
+                   make_row(c0="2", c2="Cyber City", c3="Noida")])
+    assert index.search("cyb") == [2, 3]
+    assert index.search("cyber gur") == [2]
+    assert index.search("cyber pune") == []
+
+
+def test_empty_query_returns_every_row():
+    index = build([make_row(c0="1"), make_row(c0="2")])
+    assert index.search("") == [2, 3]
+
+
+def test_sync_reindexes_only_changed_rows():
+    index = build([make_row(c0="1", c2="Alpha"), make_row(c0="2", c2="Beta")])
+    index.sync([HEADERS, make_row(c0="1", c2="Gamma")], 2)
+    assert index.search("alpha") == []
+    assert index.search("beta") == []
+    assert index.search("gamma") == [2]
+
+
+def test_same_version_is_not_resynced():
+    index = build([make_row(c0="1", c2="Alpha")])
+    index.sync([HEADERS], 1)
+    assert index.search("alpha") == [2]
+
+
+def test_trigrams_pad_word_edges():
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_fuzzy_search_ranks_misspellings():
+    index = build([make_row(c0="1", c2="Ambience Mall"),
+                   make_row(c0="2", c2="Ambient Tower"),
+                   make_row(c0="3", c2="Unrelated")])
+    ranked = index.fuzzy_search("ambiance")
+    assert [row_number for row_number, _ in ranked][:1] == [2]
+    assert 4 not in [row_number for row_number, _ in ranked]
+    assert all(score >= 0.3 for _, score in ranked)
+
+
+def test_fuzzy_search_only_looks_at_fuzzy_columns():
+    index = build([make_row(c0="1", c5="Ambience")])
+    assert index.fuzzy_search("ambience") == []
@@ -0,0 +1,141 @@
+import pytest
+
+from sheet_cache import SheetCache, column_index, column_letter, parse_columns
+
+
+class FakeSheet:
+    """Just enough of a gspread worksheet, counting the reads it serves"""
+
+    def __init__(self, values):
+        self.values = values
+        self.full_reads = 0
+        self.batch_reads = []
+
+    def get_all_values(self):
+        self.full_reads += 1
+        return [list(row) for row in self.values]
+
+    def batch_get(self, ranges):
+        self.batch_reads.append(ranges)
+        results = []
+        for spec in ranges:
+            start, end = (column_index(part) for part in spec.split(':'))
+            rows = [row[start:end + 1] for row in self.values]
+            # The API trims trailing blank cells and rows
+            rows = [row[:max([i + 1 for i, cell in enumerate(row) if cell] or [0])] for row in rows]
+            while rows and not rows[-1]:
+                rows.pop()
+            results.append(rows)
+        return results
+
+
+class FakeMirror:
+    def __init__(self):
+        self.synced = []
+
+    def sync(self, values):
+        self.synced.append(values)
+
+
+def sheet():
+    return FakeSheet([["Asset ID", "Date", "Name", "Location"],
+                      ["1", "01-02-2025", "Hub", "Gurgaon"],
+                      ["2", "03-04-2025", "City", "Noida"]])
+
+
+def test_column_letters_round_trip():
+    assert [column_letter(i) for i in (0, 25, 26, 28)] == ["A", "Z", "AA", "AC"]
+    assert column_index("AC") == 28
+    assert parse_columns(("C", "A:B", "AC")) == [0, 1, 2, 28]
+
+
+def test_cold_start_reads_the_whole_sheet():
+    fake = sheet()
+    cache = SheetCache(fake)
+    assert cache.get_columns(("D",))[1] == ["1", "01-02-2025", "Hub", "Gurgaon"]
+    assert fake.full_reads == 1 and fake.batch_reads == []
+
+
+def test_fresh_snapshot_is_reused():
+    fake = sheet()
+    cache = SheetCache(fake)
+    cache.get_all_values()
+    cache.get_columns(("C:D",))
+    assert fake.full_reads == 1 and fake.batch_reads == []
+
+
+def test_invalidated_snapshot_merges_only_the_requested_columns():
+    fake = sheet()
+    mirror = FakeMirror()
+    cache = SheetCache(fake, mirror=mirror)
+    cache.get_all_values()
+    fake.values[1][3] = "Delhi"
+    fake.values[2][1] = "12-31-2025"
+    cache.invalidate()
+
+    values = cache.get_columns(("D",))
+    assert fake.batch_reads == [["A:A", "D:D"]]
+    assert values[1] == ["1", "01-02-2025", "Hub", "Delhi"]
+    assert values[2][1] == "03-04-2025"    # not asked for, so left as last read
+    assert len(mirror.synced) == 1         # merges never reach the mirror
+
+    # The merged columns are now current; others still need a read
+    cache.get_columns(("D",))
+    assert len(fake.batch_reads) == 1
+    cache.get_all_values()
+    assert fake.full_reads == 2
+
+
+def test_rows_that_no_longer_line_up_fall_back_to_a_full_read():
+    fake = sheet()
+    cache = SheetCache(fake)
+    cache.get_all_values()
+    del fake.values[1]
+    cache.invalidate()
+
+    values = cache.get_columns(("D",))
+    assert fake.full_reads == 2
+    assert values == fake.values
+    assert cache.lookup("1") is None
+
+
+def test_trailing_blank_ids_still_line_up():
+    fake = sheet()
+    fake.values.append(["", "", "note", ""])
+    cache = SheetCache(fake)
+    cache.get_all_values()
+    cache.invalidate()
+    cache.get_columns(("C",))
+    assert fake.full_reads == 1 and len(fake.batch_reads) == 1
+
+
+@pytest.mark.parametrize("ttl, force", [(300, True), (0, False)])
+def test_forced_or_expired_refreshes_read_every_column(ttl, force):
+    fake = sheet()
+    mirror = FakeMirror()
+    cache = SheetCache(fake, ttl=ttl, mirror=mirror)
+    cache.get_all_values()
+    fake.values[1][1] = "05-06-2025"
+
+    values = cache.get_columns(("D",), force=force)
+    assert fake.batch_reads == []
+    assert values[1][1] == "05-06-2025"
+    assert len(mirror.synced) == 2
+
+
+def test_seeded_snapshot_counts_as_a_full_read():
+    fake = sheet()
+    cache = SheetCache(fake)
+    cache.seed(fake.get_all_values())
+    cache.invalidate()
+    cache.get_columns(("B",))
+    assert fake.full_reads == 1 and len(fake.batch_reads) == 1
+
+
+def test_append_out_of_step_forces_a_full_read():
+    fake = sheet()
+    cache = SheetCache(fake)
+    cache.get_all_values()
+    assert not cache.append_local(10, ["9"])
+    cache.get_columns(("D",))
+    assert fake.full_reads == 2 and fake.batch_reads == []
@@ -0,0 +1,37 @@
+import datetime
+
+import pytest
+
+from sheet_dates import date_ordinal
+
+
+def test_sheet_format_fast_path():
+    assert date_ordinal("01-31-2025") == datetime.date(2025, 1, 31).toordinal()
+    assert date_ordinal("1-2-2025") == datetime.date(2025, 1, 2).toordinal()
+
+
+def test_blank_is_none():
+    assert date_ordinal("") is None
+    assert date_ordinal("   ") is None
+
+
+def test_surrounding_whitespace_is_ignored():
+    assert date_ordinal(" 03-04-2025 ") == datetime.date(2025, 3, 4).toordinal()
+
+
+@pytest.mark.parametrize("text", ["13-01-2025", "02-30-2024", "00-10-2025"])
+def test_sheet_format_is_strict(text):
+    # mm-dd-yyyy shapes that are not real dates are not handed to dateutil
+    with pytest.raises(ValueError):
+        date_ordinal(text)
+
+
+def test_other_formats_fall_back_to_dateutil():
+    assert date_ordinal("March 3 2025") == datetime.date(2025, 3, 3).toordinal()
+    assert date_ordinal("2025-03-04") == datetime.date(2025, 3, 4).toordinal()
+
+
+def test_unreadable_text_raises_every_time():
+    for _ in range(2):  # the second call is answered from the memo
+        with pytest.raises(ValueError):
+            date_ordinal("garbage")
@@ -0,0 +1,68 @@
+import sqlite3
+
+from sheet_mirror import SheetMirror
+
+
+VALUES = [["Asset ID", "Name"], ["1", "Hub"], ["2", "City"], ["3", "Tower"]]
+
+
+def mirror(tmp_path):
+    return SheetMirror(str(tmp_path / "mirror" / "sheet.sqlite3"))
+
+
+def test_empty_mirror_loads_nothing(tmp_path):
+    assert mirror(tmp_path).load() is None
+
+
+def test_sync_round_trips(tmp_path):
+    m = mirror(tmp_path)
+    assert m.sync(VALUES) == (3, 0)
+    assert m.load() == VALUES
+
+
+def test_resync_writes_only_changed_rows(tmp_path):
+    m = mirror(tmp_path)
+    m.sync(VALUES)
+    assert m.sync(VALUES) == (0, 0)
+
+    edited = [list(row) for row in VALUES]
+    edited[2][1] = "Cyber City"
+    assert m.sync(edited) == (1, 0)
+    assert m.load() == edited
+
+
+def test_rows_removed_upstream_are_deleted(tmp_path):
+    m = mirror(tmp_path)
+    m.sync(VALUES)
+    assert m.sync(VALUES[:2]) == (0, 2)
+    assert m.load() == VALUES[:2]
+
+
+def test_upsert_rows_after_a_local_edit(tmp_path):
+    m = mirror(tmp_path)
+    m.sync(VALUES)
+    m.upsert_rows([(3, ["2", "Renamed"]), (5, ["4", "New"])])
+    assert m.load()[2:] == [["2", "Renamed"], ["3", "Tower"], ["4", "New"]]
+
+
+def test_survives_reopening(tmp_path):
+    m = mirror(tmp_path)
+    m.sync(VALUES)
+    m.close()
+    assert mirror(tmp_path).load() == VALUES
+
+
+def test_old_schema_is_dropped(tmp_path):
+    path = tmp_path / "old.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO meta VALUES ('headers', '[\"Asset ID\"]')")
+    conn.execute("CREATE TABLE rows (row_number INTEGER PRIMARY KEY, row_hash TEXT, "
+                 "data TEXT, location TEXT)")
+    conn.commit()
+    conn.close()
+
+    m = SheetMirror(str(path))
+    assert m.load() is None
+    assert m.sync(VALUES) == (3, 0)
+    assert m.load() == VALUES
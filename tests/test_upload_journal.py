@@ -0,0 +1,72 @@
+import json
+
+from upload_journal import UploadJournal
+
+
+def journal(tmp_path):
+    return UploadJournal(str(tmp_path / "state" / "journal.json"))
+
+
+def test_missing_or_corrupt_journal_starts_empty(tmp_path):
+    assert journal(tmp_path).pending() == {}
+    (tmp_path / "state" / "journal.json").write_text("{not json")
+    j = journal(tmp_path)
+    assert j.pending() == {} and j.pending_submissions() == {}
+
+
+def test_upload_sessions_survive_a_restart(tmp_path):
+    j = journal(tmp_path)
+    j.record("a", uri="https://upload/1", offset=0)
+    j.record("a", offset=262144)
+    j.record("b", uri="https://upload/2")
+    j.remove("b")
+
+    reopened = journal(tmp_path)
+    assert reopened.pending() == {"a": {"uri": "https://upload/1", "offset": 262144}}
+    assert reopened.get("b") is None
+
+
+def test_key_changes_when_the_file_does(tmp_path):
+    path = tmp_path / "lease.pdf"
+    path.write_bytes(b"one")
+    before = UploadJournal.key_for(str(path), "folder")
+    path.write_bytes(b"longer")
+    assert UploadJournal.key_for(str(path), "folder") != before
+    assert UploadJournal.key_for(str(path), "other") != UploadJournal.key_for(str(path), "folder")
+
+
+def test_submission_key_ignores_document_order():
+    first = UploadJournal.submission_key("AST-1", {"KYC": "/a.pdf", "Lease": "/b.pdf"})
+    second = UploadJournal.submission_key("AST-1", {"Lease": "/b.pdf", "KYC": "/a.pdf"})
+    assert first == second
+    assert UploadJournal.submission_key("AST-2", {"KYC": "/a.pdf", "Lease": "/b.pdf"}) != first
+
+
+def test_submissions_record_progress_item_by_item(tmp_path):
+    j = journal(tmp_path)
+    j.record_submission("s", asset_folder_name="AST-1", row=["1", "Hub"])
+    j.record_submission("s", asset_folder_id="folder")
+    j.record_submission_item("s", "subfolders", "KYC", "sub-1")
+    j.record_submission_item("s", "uploaded", "KYC", "file-1")
+
+    entry = journal(tmp_path).get_submission("s")
+    assert entry == {"asset_folder_name": "AST-1", "row": ["1", "Hub"], "asset_folder_id": "folder",
+                     "subfolders": {"KYC": "sub-1"}, "uploaded": {"KYC": "file-1"}}
+
+    # Callers get copies, not the journal's own state
+    entry["subfolders"]["KYC"] = "changed"
+    assert j.get_submission("s")["subfolders"] == {"KYC": "sub-1"}
+
+    j.remove_submission("s")
+    assert journal(tmp_path).pending_submissions() == {}
+
+
+def test_uploads_only_journal_is_migrated(tmp_path):
+    path = tmp_path / "state" / "journal.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({"a": {"uri": "https://upload/1", "offset": 0}}))
+
+    j = journal(tmp_path)
+    assert j.pending() == {"a": {"uri": "https://upload/1", "offset": 0}}
+    j.record_submission("s", asset_folder_name="AST-1")
+    assert set(json.loads(path.read_text())) == {"uploads", "submissions"}
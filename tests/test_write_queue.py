@@ -0,0 +1,131 @@
+from write_queue import WriteQueue
+
+
+class FakeMaster:
+    """Stands in for the Tk root: after() timers are only recorded"""
+
+    def __init__(self):
+        self.timers = {}
+
+    def after(self, delay_ms, callback):
+        after_id = len(self.timers) + 1
+        self.timers[after_id] = callback
+        return after_id
+
+    def after_cancel(self, after_id):
+        del self.timers[after_id]
+
+
+class FakeIO:
+    """Runs jobs straight away on the calling thread"""
+
+    def submit(self, fn, *args, on_success=None, on_error=None, **kwargs):
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            on_error(e)
+        else:
+            on_success(result)
+
+
+class FakeSheet:
+    def __init__(self, fail=0):
+        self.batches = []
+        self.fail = fail
+
+    def batch_update(self, data, value_input_option=None):
+        if self.fail:
+            self.fail -= 1
+            raise IOError("quota exceeded")
+        self.batches.append(data)
+
+
+class FakeCache:
+    def __init__(self):
+        self.cells = []
+
+    def apply_cells(self, cells):
+        self.cells.extend(cells)
+
+
+def queue(sheet, **kwargs):
+    return WriteQueue(FakeMaster(), sheet, FakeIO(), **kwargs)
+
+
+def test_writes_inside_one_window_go_out_as_one_batch():
+    sheet = FakeSheet()
+    cache = FakeCache()
+    q = queue(sheet, cache=cache)
+    q.update_cell(5, 23, "Pending")
+    q.update_cell(6, 23, "Received")
+    assert len(q.master.timers) == 1    # one flush timer for the window
+
+    q.flush()
+    assert sheet.batches == [[{'range': "W5", 'values': [["Pending"]]},
+                              {'range': "W6", 'values': [["Received"]]}]]
+    assert cache.cells == [(5, 23, "Pending"), (6, 23, "Received")]
+    assert q.master.timers == {} and q.pending == {}
+
+
+def test_repeated_writes_to_a_cell_keep_the_last_value():
+    sheet = FakeSheet()
+    done = []
+    q = queue(sheet)
+    q.update_cell(5, 23, "Received", on_done=done.append)
+    q.update_cell(5, 23, "Pending", on_done=done.append)
+    q.flush()
+    assert sheet.batches == [[{'range': "W5", 'values': [["Pending"]]}]]
+    assert done == [None, None]
+
+
+def test_a_row_update_is_acknowledged_once():
+    sheet = FakeSheet()
+    done = []
+    q = queue(sheet)
+    q.update_row(7, ["a", "b", "c"], start_col=27, on_done=done.append)
+    q.flush()
+    assert [write['range'] for write in sheet.batches[0]] == ["AA7", "AB7", "AC7"]
+    assert done == [None]
+
+
+def test_empty_flush_sends_nothing():
+    sheet = FakeSheet()
+    assert queue(sheet).flush() is None
+    assert sheet.batches == []
+
+
+def test_failed_writes_are_held_for_retry():
+    sheet = FakeSheet(fail=1)
+    failures = []
+    q = queue(sheet, on_failure=lambda error, count: failures.append(count))
+    q.update_cell(5, 23, "Received")
+    q.flush()
+    assert failures == [1] and len(q.failed) == 1
+
+    # A newer value queued since the failure wins the retry
+    q.update_cell(5, 23, "Pending")
+    q.retry_failed()
+    assert sheet.batches == [[{'range': "W5", 'values': [["Pending"]]}]]
+    assert q.failed == []
+
+
+def test_discarded_writes_report_the_error():
+    sheet = FakeSheet(fail=1)
+    done = []
+    q = queue(sheet)    # no on_failure: failures are discarded straight away
+    q.update_cell(5, 23, "Received", on_done=done.append)
+    q.flush()
+    assert len(done) == 1 and isinstance(done[0], IOError)
+    assert q.failed == []
+
+
+def test_shutdown_flush_includes_failed_writes():
+    sheet = FakeSheet(fail=1)
+    q = queue(sheet, on_failure=lambda error, count: None)
+    q.update_cell(5, 23, "Received")
+    q.flush()
+    q.update_cell(6, 23, "Pending")
+
+    q.flush_blocking()
+    assert sorted(write['range'] for write in sheet.batches[0]) == ["W5", "W6"]
+    assert q.failed == [] and q.pending == {}
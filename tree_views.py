@@ -0,0 +1,370 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+# Row count from which the tabs switch their Treeview into virtual mode
+VIRTUAL_THRESHOLD = 2000
+
+
+def visible_rows(tree):
+    """Number of rows that fit in the tree's current height"""
+    style = tree.cget('style') or 'Treeview'
+    rowheight = int(float(ttk.Style().lookup(style, 'rowheight') or 20))
+    height = tree.winfo_height()
+    if height <= 1:
+        # Not mapped yet; fall back to the configured height in rows
+        return int(tree.cget('height'))
+    # One row's worth of space goes to the headings
+    return max(1, height // rowheight - 1)
+
+
+class ChunkedTreeFiller:
+    """Brings a Treeview in line with a new row list a few rows at a time.
+
+    Items are keyed by the first value of each row (the Asset ID), so a
+    refresh only inserts, updates or deletes the rows that actually changed
+    and selection and scroll position survive. The first screenful is
+    applied straight away; the rest goes in after() chunks that each stay
+    within ``budget_ms`` so the UI keeps responding however many rows there
+    are. Starting a new fill cancels the one in progress.
+    """
+
+    def __init__(self, tree, budget_ms=8, key=None):
+        self.tree = tree
+        self.budget = budget_ms / 1000
+        self.key = key or (lambda values: values[0])
+        self.items = {}    # key -> Treeview item id
+        self.shown = {}    # key -> (values, tags) currently displayed
+        self.rows = []
+        self.index = 0
+        self.reorder = False
+        self._after_id = None
+
+    def fill(self, rows):
+        self.cancel()
+
+        keyed = self._keyed(rows)
+        new_keys = {key for key, values, tags in keyed}
+
+        # Deletes go out in a single call
+        gone = [key for key in self.items if key not in new_keys]
+        if gone:
+            self.tree.delete(*(self.items.pop(key) for key in gone))
+            for key in gone:
+                del self.shown[key]
+
+        # Surviving items only need moving if their relative order changed
+        current = self._ordered_keys()
+        wanted = [key for key, values, tags in keyed if key in self.items]
+        self.reorder = current != wanted
+
+        self.rows = keyed
+        self.index = 0
+        self._apply(visible_rows(self.tree), None)
+        self._schedule()
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.tree.after_cancel(self._after_id)
+            self._after_id = None
+
+    def reset(self):
+        """Forget the displayed rows after something else cleared the tree"""
+        self.cancel()
+        self.items = {}
+        self.shown = {}
+        self.rows = []
+
+    def _keyed(self, rows):
+        # Repeated keys (duplicate Asset IDs) are told apart by occurrence
+        seen = {}
+        keyed = []
+        for values, tags in rows:
+            key = self.key(values)
+            count = seen.get(key, 0)
+            seen[key] = count + 1
+            keyed.append(((key, count), list(values), tuple(tags)))
+        return keyed
+
+    def _ordered_keys(self):
+        by_item = {item: key for key, item in self.items.items()}
+        return [by_item[item] for item in self.tree.get_children() if item in by_item]
+
+    def _apply(self, limit, deadline):
+        end = min(len(self.rows), self.index + limit)
+        while self.index < end:
+            key, values, tags = self.rows[self.index]
+            item = self.items.get(key)
+            if item is None:
+                self.items[key] = self.tree.insert('', self.index, values=values, tags=tags)
+            else:
+                if self.shown[key] != (values, tags):
+                    self.tree.item(item, values=values, tags=tags)
+                if self.reorder:
+                    self.tree.move(item, '', self.index)
+            self.shown[key] = (values, tags)
+            self.index += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+    def _schedule(self):
+        if self.index < len(self.rows):
+            self._after_id = self.tree.after(1, self._tick)
+        else:
+            self._after_id = None
+            self.rows = []
+
+    def _tick(self):
+        self._after_id = None
+        self._apply(len(self.rows), time.perf_counter() + self.budget)
+        self._schedule()
+
+
+class ColumnSorter:
+    """Click-to-sort state for a Treeview's headings.
+
+    ``columns`` maps each Treeview column to the sheet column its values
+    come from, so sorting runs on the ColumnStore's typed, cached
+    permutations rather than on values read back from Tk. ``on_change`` is
+    called whenever the sort column or direction changes.
+    """
+
+    def __init__(self, tree, columns, on_change):
+        self.tree = tree
+        self.columns = columns
+        self.on_change = on_change
+        self.column = None
+        self.descending = False
+        self.labels = {column: tree.heading(column, 'text') for column in columns}
+        for column in columns:
+            tree.heading(column, command=lambda c=column: self.toggle(c))
+
+    def toggle(self, column):
+        if column == self.column:
+            self.descending = not self.descending
+        else:
+            self.column = column
+            self.descending = False
+
+        self._update_headings()
+        self.on_change()
+
+    def relabel(self, column, label):
+        """Change a heading's text, keeping its sort arrow"""
+        self.labels[column] = label
+        self._update_headings()
+
+    def _update_headings(self):
+        for col, label in self.labels.items():
+            arrow = (' ▼' if self.descending else ' ▲') if col == self.column else ''
+            self.tree.heading(col, text=label + arrow)
+
+    def apply(self, store, positions):
+        """Return ``positions`` in the selected order (unchanged if none)"""
+        if self.column is None:
+            return positions
+        return store.sort(positions, self.columns[self.column], self.descending)
+
+
+class VirtualTreeview:
+    """Displays a large row list in a ttk.Treeview without inserting every row.
+
+    Only the rows in view (plus a small buffer) exist as Treeview items. The
+    items are re-bound to different rows as the user scrolls, while the
+    scrollbar tracks the position in the full row list. Rows are
+    ``(values, tags)`` pairs held in memory.
+    """
+
+    def __init__(self, tree, scrollbar, buffer=10):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.buffer = buffer
+        self.rows = []
+        self.offset = 0
+        self.items = []
+        self.active = False
+        self.selected_row = None
+
+        self.tree.bind('<Configure>', self._on_configure, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        for key in ('<Up>', '<Down>', '<Prior>', '<Next>'):
+            self.tree.bind(key, self._on_key, add='+')
+
+    def attach(self):
+        """Take over the tree and scrollbar; any regular items are removed"""
+        if self.active:
+            return
+        self.tree.delete(*self.tree.get_children())
+        self.items = []
+        self.offset = 0
+        self.selected_row = None
+        self.active = True
+        self.tree.configure(yscrollcommand=lambda *args: None)
+        self.scrollbar.configure(command=self._on_scrollbar)
+
+    def detach(self):
+        """Hand the tree and scrollbar back for regular use"""
+        if not self.active:
+            return
+        self.tree.delete(*self.items)
+        self.items = []
+        self.rows = []
+        self.active = False
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+
+    def set_rows(self, rows):
+        self.attach()
+        self.rows = rows
+        if self.selected_row is not None and self.selected_row >= len(rows):
+            self.selected_row = None
+        self._render()
+
+    def scroll(self, units):
+        self.offset += units
+        self._render()
+
+    def row_index(self, item):
+        """Index into ``rows`` of the row currently bound to ``item``"""
+        return self.offset + self.items.index(item)
+
+    def visible_count(self):
+        return visible_rows(self.tree)
+
+    def _render(self):
+        visible = self.visible_count()
+        total = len(self.rows)
+        self.offset = max(0, min(self.offset, total - visible))
+        count = min(visible + self.buffer, total - self.offset)
+
+        # Grow or shrink the pool of items, then re-bind them to the window
+        while len(self.items) < count:
+            self.items.append(self.tree.insert('', tk.END))
+        while len(self.items) > count:
+            self.tree.delete(self.items.pop())
+
+        for i, item in enumerate(self.items):
+            values, tags = self.rows[self.offset + i]
+            self.tree.item(item, values=values, tags=tags)
+
+        # Selection follows the row, not the recycled item
+        if self.selected_row is not None and self.offset <= self.selected_row < self.offset + count:
+            item = self.items[self.selected_row - self.offset]
+            self.tree.selection_set(item)
+            self.tree.focus(item)
+        elif self.tree.selection():
+            self.tree.selection_set(())
+
+        self.tree.yview_moveto(0)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_scrollbar(self, *args):
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * len(self.rows))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.visible_count()
+            self.offset += amount
+        self._render()
+
+    def _on_configure(self, event):
+        if self.active:
+            self._render()
+
+    def _on_select(self, event):
+        if not self.active:
+            return
+        selection = self.tree.selection()
+        if selection and selection[0] in self.items:
+            self.selected_row = self.row_index(selection[0])
+
+    def _on_key(self, event):
+        if not self.active or not self.rows:
+            return None
+
+        visible = self.visible_count()
+        step = {'Up': -1, 'Down': 1, 'Prior': -visible, 'Next': visible}[event.keysym]
+        current = self.selected_row if self.selected_row is not None else self.offset
+        target = max(0, min(current + step, len(self.rows) - 1))
+
+        # Scroll just enough to keep the new selection in view
+        if target < self.offset:
+            self.offset = target
+        elif target >= self.offset + visible:
+            self.offset = target - visible + 1
+        self.selected_row = target
+        self._render()
+        return 'break'
+
+
+class TreeLoader:
+    """Loads a tab's rows on the I/O worker and shows them in its Treeview.
+
+    Starting a load cancels the one still in flight along with any chunked
+    fill, and ``loading_label`` and the cursor show it is running. A failure
+    is reported as "Failed to load <what>". Row lists of VIRTUAL_THRESHOLD
+    rows or more go through a VirtualTreeview; shorter ones are diffed in by
+    a ChunkedTreeFiller.
+    """
+
+    def __init__(self, tree, scrollbar, io, loading_label, what):
+        self.tree = tree
+        self.io = io
+        self.loading_label = loading_label
+        self.what = what
+        self.virtual = VirtualTreeview(tree, scrollbar)
+        self.filler = ChunkedTreeFiller(tree)
+        self.job = None
+
+    @property
+    def loading(self):
+        return self.job is not None
+
+    def load(self, fn, on_loaded):
+        """Run ``fn`` on the worker, then ``on_loaded(result)`` on the Tk thread"""
+        self.cancel()
+        self._set_loading(True)
+        self.job = self.io.submit(fn,
+                                  on_success=lambda result: self._on_loaded(on_loaded, result),
+                                  on_error=self._on_error)
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+            self._set_loading(False)
+        self.filler.cancel()
+
+    def show_rows(self, rows):
+        """Display ``(values, tags)`` rows, switching between virtual and chunked mode"""
+        if len(rows) >= VIRTUAL_THRESHOLD:
+            self.filler.reset()
+            self.virtual.set_rows(rows)
+            return
+
+        self.virtual.detach()
+        self.filler.fill(rows)
+
+    def scroll(self, units):
+        if self.virtual.active:
+            self.virtual.scroll(units)
+        else:
+            self.tree.yview_scroll(units, "units")
+
+    def _on_loaded(self, on_loaded, result):
+        self.job = None
+        self._set_loading(False)
+        on_loaded(result)
+
+    def _on_error(self, error):
+        self.job = None
+        self._set_loading(False)
+        messagebox.showerror("Error", f"Failed to load {self.what}: {str(error)}")
+
+    def _set_loading(self, loading):
+        self.loading_label.configure(text="Loading…" if loading else "")
+        self.tree.configure(cursor="watch" if loading else "")
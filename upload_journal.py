@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import threading
+
+
+def default_journal_path():
+    return os.path.join(os.path.expanduser("~"), ".assetra", "upload_journal.json")
+
+
+class UploadJournal:
+    """On-disk record of asset submissions and upload sessions still in progress.
+
+    A submission entry holds everything needed to finish an asset: its
+    folder name, the documents, the Drive folders already created for them,
+    the files already uploaded and the sheet row waiting to be appended.
+    Each upload entry remembers the Drive session URI and how many bytes the
+    server has acknowledged. Together they let a submission cut off by a
+    failed upload or a crash carry on in the same folders, on a retry or on
+    the next launch, instead of starting over.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_journal_path()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.entries, self.submissions = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+        if 'uploads' not in data:
+            # Journals from before submissions were recorded hold uploads only
+            return data, {}
+        return data['uploads'], data.get('submissions', {})
+
+    def _save(self):
+        # Write to a temp file first so a crash never leaves a half-written journal
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'uploads': self.entries, 'submissions': self.submissions}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def key_for(file_path, folder_id):
+        stat = os.stat(file_path)
+        return f"{os.path.abspath(file_path)}|{stat.st_size}|{int(stat.st_mtime)}|{folder_id}"
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            return dict(entry) if entry else None
+
+    def record(self, key, **fields):
+        with self._lock:
+            self.entries.setdefault(key, {}).update(fields)
+            self._save()
+
+    def remove(self, key):
+        with self._lock:
+            if self.entries.pop(key, None) is not None:
+                self._save()
+
+    def pending(self):
+        with self._lock:
+            return {key: dict(entry) for key, entry in self.entries.items()}
+
+    @staticmethod
+    def submission_key(asset_folder_name, documents):
+        """Identify a submission by its folder name and {header: file path} documents"""
+        parts = [asset_folder_name] + [f"{header}={os.path.abspath(path)}"
+                                       for header, path in sorted(documents.items())]
+        return hashlib.sha1("\n".join(parts).encode('utf-8')).hexdigest()
+
+    def get_submission(self, key):
+        with self._lock:
+            entry = self.submissions.get(key)
+            return json.loads(json.dumps(entry)) if entry else None
+
+    def record_submission(self, key, **fields):
+        with self._lock:
+            self.submissions.setdefault(key, {}).update(fields)
+            self._save()
+
+    def record_submission_item(self, key, field, name, value):
+        """Set one item of a dict-valued submission field (e.g. a subfolder id)"""
+        with self._lock:
+            self.submissions.setdefault(key, {}).setdefault(field, {})[name] = value
+            self._save()
+
+    def remove_submission(self, key):
+        with self._lock:
+            if self.submissions.pop(key, None) is not None:
+                self._save()
+
+    def pending_submissions(self):
+        with self._lock:
+            return json.loads(json.dumps(self.submissions))
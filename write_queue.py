@@ -0,0 +1,124 @@
+from sheet_cache import column_letter
+
+
+class PendingWrite:
+    def __init__(self, row, col, value):
+        self.row = row
+        self.col = col
+        self.value = value
+        self.callbacks = []
+
+
+class WriteQueue:
+    """Write-behind queue for sheet mutations.
+
+    Cell and row updates are collected for ``delay_ms`` and then sent as a
+    single batch_update on the I/O worker. Repeated writes to the same cell
+    inside one window collapse into the last value. Every callback registered
+    with a write is called with ``None`` once its flush is acknowledged.
+
+    A failed flush is held back and reported through ``on_failure(error,
+    count)``; the owner can then retry_failed() or discard_failed(), the
+    latter passing the error to the writes' callbacks.
+    """
+
+    def __init__(self, master, sheet, io, cache=None, delay_ms=500, on_failure=None):
+        self.master = master
+        self.sheet = sheet
+        self.io = io
+        self.cache = cache
+        self.delay_ms = delay_ms
+        self.on_failure = on_failure
+        self.pending = {}
+        self.failed = []
+        self._flush_after_id = None
+
+    def update_cell(self, row, col, value, on_done=None):
+        """Queue a write of ``value`` to the 1-indexed (row, col) cell"""
+        write = self.pending.get((row, col))
+        if write is None:
+            write = self.pending[(row, col)] = PendingWrite(row, col, value)
+        else:
+            write.value = value
+        if on_done is not None:
+            write.callbacks.append(on_done)
+        self._schedule_flush()
+
+    def update_row(self, row, values, start_col=1, on_done=None):
+        """Queue writes for consecutive cells of a row starting at ``start_col``"""
+        for offset, value in enumerate(values):
+            self.update_cell(row, start_col + offset, value)
+        if on_done is not None:
+            # One acknowledgement for the whole row
+            self.pending[(row, start_col + len(values) - 1)].callbacks.append(on_done)
+
+    def _schedule_flush(self):
+        if self._flush_after_id is None:
+            self._flush_after_id = self.master.after(self.delay_ms, self.flush)
+
+    def flush(self):
+        """Send everything queued so far as one batch_update"""
+        if self._flush_after_id is not None:
+            self.master.after_cancel(self._flush_after_id)
+            self._flush_after_id = None
+
+        if not self.pending:
+            return None
+
+        batch = list(self.pending.values())
+        self.pending = {}
+
+        return self.io.submit(self._send, batch,
+                              on_success=lambda result: self._acknowledge(batch),
+                              on_error=lambda error: self._fail(batch, error))
+
+    def flush_blocking(self):
+        """Write everything queued, failed writes included, on the calling thread (used at shutdown)"""
+        self._requeue_failed()
+        batch = list(self.pending.values())
+        self.pending = {}
+        if batch:
+            self._send(batch)
+
+    def _send(self, batch):
+        # Runs on the I/O worker
+        data = [{'range': f"{column_letter(write.col - 1)}{write.row}", 'values': [[write.value]]}
+                for write in batch]
+        self.sheet.batch_update(data, value_input_option='USER_ENTERED')
+
+        # Keep the shared snapshot in step without refetching the sheet
+        if self.cache is not None:
+            self.cache.apply_cells([(write.row, write.col, write.value) for write in batch])
+
+    def _acknowledge(self, batch):
+        for write in batch:
+            for callback in write.callbacks:
+                callback(None)
+
+    def _fail(self, batch, error):
+        self.failed.extend(batch)
+        if self.on_failure is not None:
+            self.on_failure(error, len(self.failed))
+        else:
+            self.discard_failed(error)
+
+    def retry_failed(self):
+        """Re-queue failed writes (newer queued values win) and flush them"""
+        self._requeue_failed()
+        return self.flush()
+
+    def _requeue_failed(self):
+        failed, self.failed = self.failed, []
+        for write in failed:
+            queued = self.pending.get((write.row, write.col))
+            if queued is None:
+                self.pending[(write.row, write.col)] = write
+            else:
+                queued.callbacks = write.callbacks + queued.callbacks
+
+    def discard_failed(self, error):
+        """Drop failed writes, reporting ``error`` to their callbacks"""
+        failed, self.failed = self.failed, []
+        for write in failed:
+            for callback in write.callbacks:
+                callback(error)